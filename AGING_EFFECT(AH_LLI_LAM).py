@@ -1,12 +1,14 @@
 import pybamm
 import matplotlib.pyplot as plt
+from Aging_Campaign import AgingCampaign, summarise_cycle
 
 # Define the model
 model = pybamm.lithium_ion.DFN({"SEI": "ec reaction limited"})
 
-# Set parameter values and update SEI kinetic rate constant
+# Set parameter values; the SEI kinetic rate constant is an input parameter,
+# so other values can be rerun on the same built models
 parameter_values = pybamm.ParameterValues("Chen2020")
-parameter_values.update({"SEI kinetic rate constant [m.s-1]": 1e-14})
+inputs = {"SEI kinetic rate constant [m.s-1]": 1e-14}
 
 # Set N (number of repetitions in CCCV experiment)
 N = 10
@@ -31,43 +33,32 @@ charge_experiment = pybamm.Experiment(
     ]
 )
 
-# First simulation for CCCV experiment
-sim = pybamm.Simulation(model, experiment=cccv_experiment, parameter_values=parameter_values)
-cccv_sol = sim.solve()
+# Build each experiment's simulation once and reuse it for every set
+campaign = AgingCampaign(
+    model, parameter_values, {"cccv": cccv_experiment, "charge": charge_experiment}, inputs=list(inputs)
+)
 
-# Second simulation for Charge experiment
-sim = pybamm.Simulation(model, experiment=charge_experiment, parameter_values=parameter_values)
-charge_sol = sim.solve(starting_solution=cccv_sol)
+# First set of simulations (CCCV and Charge)
+first_set = campaign.run(["cccv", "charge"], inputs=inputs)[0]
+cccv_sol, charge_sol = first_set["cccv"], first_set["charge"]
 
-# Simulate repeated aging cycles (CCCV and Charge) 
-cccv_sols = []
-charge_sols = []
+# Simulate repeated aging cycles (CCCV and Charge), streaming per-cycle
+# summaries so the full solutions of later sets are not kept in memory.
+# Step 0 of each CCCV cycle is the discharge
 M = 5  # Number of aging cycles
-for i in range(M):
-    if i != 0:  # skip the first set of ageing cycles because it's already been done
-        sim = pybamm.Simulation(
-            model, experiment=cccv_experiment, parameter_values=parameter_values
-        )
-        cccv_sol = sim.solve(starting_solution=charge_sol)
-        sim = pybamm.Simulation(
-            model, experiment=charge_experiment, parameter_values=parameter_values
-        )
-        charge_sol = sim.solve(starting_solution=cccv_sol)
-    cccv_sols.append(cccv_sol)
-    charge_sols.append(charge_sol)
+cccv_capacities = [
+    summarise_cycle(cycle, discharge_step=0)["Discharge capacity [A.h]"] for cycle in cccv_sol.cycles
+]
+for summary in campaign.stream(
+    ["cccv", "charge"], sets=M - 1, starting_solution=charge_sol, discharge_steps={"cccv": 0}, inputs=inputs
+):
+    if summary["Experiment"] == "cccv":
+        cccv_capacities.append(summary["Discharge capacity [A.h]"])
 
 # Collect capacities for CCCV cycles 
-cccv_cycles = []
-cccv_capacities = []
-
-for i in range(M):
-    for j in range(N):
-        cccv_cycles.append(i * N + j + 1)
-        start_capacity = cccv_sols[i].cycles[j].steps[2]["Discharge capacity [A.h]"].entries[0]
-        end_capacity = cccv_sols[i].cycles[j].steps[2]["Discharge capacity [A.h]"].entries[-1]
-        cccv_capacities.append(end_capacity - start_capacity)
+cccv_cycles = list(range(1, len(cccv_capacities) + 1))
 
-# Plot summary variables for the last CCCV solution
+# Plot summary variables for the first CCCV solution
 pybamm.plot_summary_variables(cccv_sol)
 
 # Plot the capacity fade over cycles
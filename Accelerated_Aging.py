@@ -0,0 +1,44 @@
+import pybamm
+import matplotlib.pyplot as plt
+from Aging_Campaign import AgingCampaign
+
+# 1000-cycle physics-based projection with the DFN SEI model. Only about one
+# cycle in eleven is solved in full; the degradation states are extrapolated
+# over the cycles in between (see AgingCampaign.accelerate).
+pybamm.set_logging_level("NOTICE")
+
+# Define the model
+model = pybamm.lithium_ion.DFN({"SEI": "ec reaction limited"})
+parameter_values = pybamm.ParameterValues("Chen2020")
+parameter_values.update({"SEI kinetic rate constant [m.s-1]": 1e-14})
+var_pts = {"x_n": 10, "x_s": 10, "x_p": 10, "r_n": 16, "r_p": 16}
+
+# One CCCV cycle, repeated
+cycles = 1000
+cccv_experiment = pybamm.Experiment(
+    [
+        (
+            "Discharge at 1C until 2.5V",
+            "Charge at 0.3C until 4.2V",
+            "Hold at 4.2V until C/100",
+        )
+    ]
+)
+campaign = AgingCampaign(model, parameter_values, {"cccv": cccv_experiment}, var_pts=var_pts)
+
+summaries = list(campaign.accelerate("cccv", cycles, discharge_step=0))
+cycle_numbers = [s["Cycle number"] for s in summaries]
+print(f"Solved {len(summaries)} of {cycles} cycles in full")
+
+# Plot the projected capacity fade and lithium inventory loss
+fig, ax = plt.subplots(1, 2, figsize=(12, 5))
+ax[0].plot(cycle_numbers, [s["Discharge capacity [A.h]"] for s in summaries], "o-", markersize=3)
+ax[0].set_xlabel("Cycle number")
+ax[0].set_ylabel("Discharge capacity [A.h]")
+ax[0].grid(True)
+ax[1].plot(cycle_numbers, [s["Loss of lithium inventory [%]"] for s in summaries], "o-", markersize=3)
+ax[1].set_xlabel("Cycle number")
+ax[1].set_ylabel("Loss of lithium inventory [%]")
+ax[1].grid(True)
+plt.tight_layout()
+plt.show()
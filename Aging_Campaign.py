@@ -0,0 +1,198 @@
+import numpy as np
+import pybamm
+
+
+# Per-cycle metrics kept when streaming; each is read at the end of the cycle
+SUMMARY_VARIABLES = [
+    "Loss of lithium inventory [%]",
+    "Loss of active material in negative electrode [%]",
+    "Loss of active material in positive electrode [%]",
+    "X-averaged negative SEI thickness [m]",
+]
+
+
+def summarise_cycle(cycle, discharge_step=None, variables=SUMMARY_VARIABLES):
+    """Reduce one cycle of a solution to a dict of scalar metrics.
+
+    The discharge capacity is measured over `discharge_step` (an index into
+    `cycle.steps`), or over the whole cycle if it is None. Variables the
+    model does not define are skipped.
+    """
+    segment = cycle if discharge_step is None else cycle.steps[discharge_step]
+    if isinstance(segment, pybamm.EmptySolution):  # step skipped as infeasible
+        summary = {"Discharge capacity [A.h]": 0.0}
+    else:
+        capacity = segment["Discharge capacity [A.h]"].entries
+        summary = {"Discharge capacity [A.h]": capacity[-1] - capacity[0]}
+    model_variables = cycle.all_models[-1].variables
+    for name in variables:
+        if name in model_variables:
+            summary[name] = cycle[name].entries[-1]
+    return summary
+
+
+def extrapolate_state(state, previous, cycles):
+    """`state` moved on by `cycles` times its change since `previous`.
+
+    Both are `last_state`s of the same model, one cycle apart. Only the
+    differential states (SEI, LAM, crack length, the particle lithium lost to
+    them, ...) are extrapolated; the algebraic ones are recomputed by the
+    solver's consistent initialisation.
+    """
+    n = state.all_models[-1].len_rhs
+    y = np.array(state.all_ys[0], dtype=float)
+    y[:n] += cycles * (y[:n] - np.asarray(previous.all_ys[0])[:n])
+    return pybamm.Solution([state.all_ts[0]], [y], state.all_models, state.all_inputs)
+
+
+def declare_inputs(parameter_values, names):
+    """Copy of `parameter_values` with `names` turned into input parameters.
+
+    Returns (parameter values, {name: original value}); the original values
+    are the defaults for solves that do not pass that input.
+    """
+    parameter_values = parameter_values.copy()
+    defaults = {name: parameter_values[name] for name in names}
+    parameter_values.update({name: "[input]" for name in names})
+    return parameter_values, defaults
+
+
+# Runs a repeated aging campaign (e.g. N ageing cycles + charge + RPT, M times)
+# while building each experiment's Simulation only once. A pybamm.Simulation
+# keeps its parameterised/discretised step models and solver setup after the
+# first solve, so re-using it and chaining `starting_solution` avoids the
+# rebuild that a fresh Simulation per set would pay every time. Parameters
+# named in `inputs` become pybamm input parameters, so reruns with different
+# `inputs=` values re-use the built models too (parameters an experiment
+# controls, like "Ambient temperature [K]", cannot be inputs).
+class AgingCampaign:
+    def __init__(self, model, parameter_values, experiments, var_pts=None, solver=None, inputs=None):
+        self.model = model
+        self.parameter_values, self.default_inputs = declare_inputs(parameter_values, inputs or [])
+        self.experiments = dict(experiments)  # name -> pybamm.Experiment
+        self.var_pts = var_pts
+        self.solver = solver
+        self._simulations = {}
+
+    def simulation(self, name):
+        """Return the (cached) Simulation for the named experiment."""
+        if name not in self._simulations:
+            self._simulations[name] = pybamm.Simulation(
+                self.model,
+                experiment=self.experiments[name],
+                parameter_values=self.parameter_values,
+                var_pts=self.var_pts,
+                solver=self.solver,
+            )
+        return self._simulations[name]
+
+    def solve(self, name, starting_solution=None, inputs=None, **kwargs):
+        inputs = {**self.default_inputs, **(inputs or {})} or None
+        return self.simulation(name).solve(starting_solution=starting_solution, inputs=inputs, **kwargs)
+
+    def run(self, sequence, sets=1, starting_solution=None, **kwargs):
+        """Solve `sequence` (experiment names) `sets` times, chaining solutions.
+
+        Returns one dict per set mapping experiment name to its solution.
+        """
+        results = []
+        solution = starting_solution
+        for _ in range(sets):
+            set_solutions = {}
+            for name in sequence:
+                solution = self.solve(name, starting_solution=solution, **kwargs)
+                set_solutions[name] = solution
+            results.append(set_solutions)
+        return results
+
+    def stream(
+        self,
+        sequence,
+        sets=1,
+        starting_solution=None,
+        discharge_steps=None,
+        summarise=summarise_cycle,
+        esoh=None,
+        **kwargs,
+    ):
+        """Like `run`, but yield one summary dict per cycle as it finishes.
+
+        Only the last state is carried between solves, so the dense solution
+        of each experiment is dropped once its cycles have been summarised
+        and memory stays flat however many sets are run. `discharge_steps`
+        maps experiment name to the step index passed to `summarise`, which
+        defaults to `summarise_cycle`.
+
+        The summaries do not use pybamm's eSOH summary variables, so they are
+        not computed during the solve; pass an `ESOH_Cache.ESOHCache` as
+        `esoh` to add them to each summary from its memoised solves instead.
+        """
+        discharge_steps = discharge_steps or {}
+        kwargs.setdefault("calc_esoh", False)
+        state = None if starting_solution is None else starting_solution.last_state
+        cycle_number = 0
+        for set_index in range(sets):
+            for name in sequence:
+                solution = self.solve(name, starting_solution=state, **kwargs)
+                # Starting from a bare state prepends a one-point cycle for it
+                new_cycles = solution.cycles if state is None else solution.cycles[1:]
+                esoh_variables = esoh.cycles(new_cycles) if esoh is not None else [{}] * len(new_cycles)
+                for cycle, esoh_summary in zip(new_cycles, esoh_variables):
+                    cycle_number += 1
+                    summary = summarise(cycle, discharge_steps.get(name))
+                    summary.update(esoh_summary)
+                    summary.update({"Cycle number": cycle_number, "Set": set_index, "Experiment": name})
+                    yield summary
+                state = solution.last_state
+                del solution, new_cycles
+
+    def accelerate(
+        self,
+        name,
+        cycles,
+        growth=0.1,
+        max_skip=None,
+        window=2,
+        starting_solution=None,
+        discharge_step=None,
+        summarise=summarise_cycle,
+        **kwargs,
+    ):
+        """Project `cycles` repeats of the one-cycle experiment `name`, solving
+        only some of them in full.
+
+        Cycles are solved `window` at a time. After each window the slow
+        degradation states are extrapolated over the next cycles at their
+        rate over the window's last cycle (`extrapolate_state`), and the next
+        window re-syncs the fast states from there. The jump is `growth` times
+        the cycles done so far (at most `max_skip`; 0 disables skipping),
+        which suits degradation that slows down like sqrt(cycles). Yields one
+        summary per solved cycle with its "Cycle number" in the projection
+        and the "Skipped cycles" before it.
+        """
+        if len(self.experiments[name].cycle_lengths) != 1:
+            raise ValueError(f"Experiment '{name}' must be a single cycle to be accelerated")
+        if growth < 0:
+            raise ValueError(f"growth must be non-negative, got {growth}")
+        if window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+        max_skip = cycles if max_skip is None else max_skip
+        kwargs.setdefault("calc_esoh", False)
+        state = None if starting_solution is None else starting_solution.last_state
+        previous = None
+        cycle_number = skipped = 0
+        while cycle_number < cycles:
+            for _ in range(min(window, cycles - cycle_number)):
+                solution = self.solve(name, starting_solution=state, **kwargs)
+                previous, state = state, solution.last_state
+                cycle_number += 1
+                summary = summarise(solution.cycles[-1], discharge_step)
+                summary.update({"Cycle number": cycle_number, "Skipped cycles": skipped, "Experiment": name})
+                skipped = 0
+                yield summary
+                del solution
+            skip = min(int(growth * cycle_number), max_skip, cycles - cycle_number - window)
+            if skip >= 1 and previous is not None:
+                state = extrapolate_state(state, previous, skip)
+                cycle_number += skip
+                skipped = skip
@@ -1,80 +1,12 @@
 import pybamm
 import numpy as np
-import os
+from SEI_Layer import DEFAULT_PARAMETERS, build_model, solve_sei_layer, solve_sei_layers
 
-model = pybamm.BaseModel()
-# dimensional parameters
-k = pybamm.Parameter("Reaction rate constant [m.s-1]")
+model, geometry, xi = build_model()
 L_0 = pybamm.Parameter("Initial thickness [m]")
-V_hat = pybamm.Parameter("Partial molar volume [m3.mol-1]")
-c_inf = pybamm.Parameter("Bulk electrolyte solvent concentration [mol.m-3]")
-
-
-def D(cc):
-    return pybamm.FunctionParameter(
-        "Diffusivity [m2.s-1]", {"Solvent concentration [mol.m-3]": cc}
-    )
-xi = pybamm.SpatialVariable("xi", domain="SEI layer", coord_sys="cartesian")
-c = pybamm.Variable("Solvent concentration [mol.m-3]", domain="SEI layer")
-L = pybamm.Variable("SEI thickness [m]")
-
-# SEI reaction flux
-R = k * pybamm.BoundaryValue(c, "left")
-
-# solvent concentration equation
-N = -1 / L * D(c) * pybamm.grad(c)
-dcdt = (V_hat * R) / L * pybamm.inner(xi, pybamm.grad(c)) - 1 / L * pybamm.div(N)
-
-# SEI thickness equation
-dLdt = V_hat * R
-
-model.rhs = {c: dcdt, L: dLdt}
-
-D_left = pybamm.BoundaryValue(
-    D(c), "left"
-)  # pybamm requires BoundaryValue(D(c)) and not D(BoundaryValue(c))
-grad_c_left = R * L / D_left
-
-
-c_right = c_inf
-
-model.boundary_conditions = {
-    c: {"left": (grad_c_left, "Neumann"), "right": (c_right, "Dirichlet")}
-}
-
-c_init = c_inf
-L_init = L_0
-
-model.initial_conditions = {c: c_init, L: L_init}
-
-
-model.variables = {
-    "SEI thickness [m]": L,
-    "SEI growth rate [m]": dLdt,
-    "Solvent concentration [mol.m-3]": c,
-}
-
-
-# define geometry
-geometry = pybamm.Geometry(
-    {"SEI layer": {xi: {"min": pybamm.Scalar(0), "max": pybamm.Scalar(1)}}}
-)
-
-
-def Diffusivity(cc):
-    return cc * 10 ** (-12)
-
 
 # parameter values (not physically based, for example only!)
-param = pybamm.ParameterValues(
-    {
-        "Reaction rate constant [m.s-1]": 1e-6,
-        "Initial thickness [m]": 1e-6,
-        "Partial molar volume [m3.mol-1]": 10,
-        "Bulk electrolyte solvent concentration [mol.m-3]": 1,
-        "Diffusivity [m2.s-1]": Diffusivity,
-    }
-)
+param = pybamm.ParameterValues(DEFAULT_PARAMETERS)
 
 # process model and geometry
 param.process_model(model)
@@ -89,8 +21,6 @@ spatial_methods = {"SEI layer": pybamm.FiniteVolume()}
 disc = pybamm.Discretisation(mesh, spatial_methods)
 disc.process_model(model)
 
-<pybamm.models.base_model.BaseModel at 0x7f3a8005b490>
-
 # solve
 solver = pybamm.ScipySolver()
 t = [0, 100]  # solve for 100s
@@ -100,6 +30,29 @@ solution = solver.solve(model, t)
 L_out = solution["SEI thickness [m]"]
 c_out = solution["Solvent concentration [mol.m-3]"]
 
+# the same model over ten years of calendar time, with the implicit sparse solver
+year = 365 * 24 * 3600
+long_run = solve_sei_layer(10 * year, t_eval=np.linspace(0, 10 * year, 121))
+
+# spread of ten-year growth over 200 cells with varying rate constant,
+# initial thickness and diffusivity, integrated as one batch (long-term growth
+# is diffusion limited, so the diffusivity drives most of the spread)
+rng = np.random.default_rng(0)
+D_ref = 1e-12 * rng.lognormal(0, 0.3, 200)
+population = solve_sei_layers(
+    10 * year,
+    {
+        "Reaction rate constant [m.s-1]": 1e-6 * rng.lognormal(0, 0.3, 200),
+        "Initial thickness [m]": 1e-6 * rng.lognormal(0, 0.2, 200),
+        "Diffusivity [m2.s-1]": lambda cc: D_ref[:, None] * cc,
+        "Diffusivity derivative [m5.s-1.mol-1]": lambda cc: D_ref[:, None] + 0 * cc,
+    },
+    points=30,
+    t_eval=[10 * year],
+)
+L_spread = np.percentile(population["SEI thickness [m]"][:, -1], [5, 50, 95])
+print("Ten-year SEI thickness, 5/50/95% of cells [um]: " + ", ".join(f"{L * 1e6:.3f}" for L in L_spread))
+
 import matplotlib.pyplot as plt
 
 # plot SEI thickness in microns as a function of t in microseconds
@@ -109,7 +62,7 @@ xi = np.linspace(0, 1, 100)  # dimensionless space
 
 
 def plot(t):
-    _, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 5))
+    _, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(15, 5))
     ax1.plot(solution.t, L_out(solution.t) * 1e6)
     ax1.plot(t, L_out(t) * 1e6, "r.")
     ax1.set_ylabel(r"SEI thickness [$\mu$m]")
@@ -121,7 +74,23 @@ def plot(t):
     ax2.set_ylabel("Solvent concentration [mol.m-3]")
     ax2.set_xlabel(r"x [$\mu$m]")
 
+    # ten-year growth, with the population's 5/50/95% thickness at the end
+    ax3.plot(long_run["Time [s]"] / year, long_run["SEI thickness [m]"] * 1e6, label="reference cell")
+    ax3.errorbar(
+        10,
+        L_spread[1] * 1e6,
+        yerr=[[(L_spread[1] - L_spread[0]) * 1e6], [(L_spread[2] - L_spread[1]) * 1e6]],
+        fmt="ro",
+        capsize=4,
+        label="200 cells (5/50/95%)",
+    )
+    ax3.set_ylabel(r"SEI thickness [$\mu$m]")
+    ax3.set_xlabel("t [years]")
+    ax3.legend()
+
     plt.tight_layout()
     plt.show()
 
 
+# concentration profile at t = 50 s, alongside the ten-year growth
+plot(50)
@@ -1,5 +1,6 @@
-import pybamm
+import numpy as np
 import matplotlib.pyplot as plt
+from Fleet_Fade import geometric_fade, percentile_bands, sample_rates
 
 # Define the initial capacity
 initial_capacity = 5  # 5 Ah
@@ -10,18 +11,27 @@ num_cycles = 1000
 # Define a simple linear capacity fade model
 capacity_fade_rate = 0.001  # 0.1% capacity fade per cycle
 
-# Create an array to store the capacity at each cycle
-capacity = [initial_capacity]
+# Fleet of cells with manufacturing variation in the fade rate
+num_cells = 100000
+rate_spread = 0.1  # 10% relative standard deviation
 
-# Simulate the capacity fade over the number of cycles
-for cycle in range(1, num_cycles + 1):
-    capacity.append(capacity[-1] * (1 - capacity_fade_rate))
+# Capacity at each cycle, in closed form
+cycle_numbers = np.arange(num_cycles + 1)
+capacity = geometric_fade(cycle_numbers, capacity_fade_rate, initial_capacity)[0]
+
+# 5th / 50th / 95th percentile of the fleet
+rates = sample_rates(capacity_fade_rate, rate_spread, num_cells, seed=0)
+low, median, high = percentile_bands(
+    cycle_numbers, "geometric", rate=rates, initial_capacity=initial_capacity
+)
 
 # Plot the capacity fade graph
-plt.plot(range(num_cycles + 1), capacity, label="Capacity Fade")
+plt.fill_between(cycle_numbers, low, high, alpha=0.3, label=f"Fleet 5-95% ({num_cells} cells)")
+plt.plot(cycle_numbers, median, "--", label="Fleet median")
+plt.plot(cycle_numbers, capacity, label="Capacity Fade")
 plt.xlabel("Cycle Number")
 plt.ylabel("Capacity (Ah)")
 plt.title("Capacity Fade Over Cycles")
 plt.grid(True)
 plt.legend()
-plt.show()
\ No newline at end of file
+plt.show()
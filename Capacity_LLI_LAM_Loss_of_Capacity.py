@@ -1,5 +1,6 @@
 import pybamm
 import matplotlib.pyplot as plt
+from Aging_Campaign import AgingCampaign, summarise_cycle
 
 # Define the model
 model = pybamm.lithium_ion.DFN({"SEI": "ec reaction limited"})
@@ -34,60 +35,45 @@ charge_experiment = pybamm.Experiment(
 
 rpt_experiment = pybamm.Experiment([("Discharge at C/3 until 3V",)])
 
-# First simulation for CCCV experiment
-sim = pybamm.Simulation(model, experiment=cccv_experiment, parameter_values=parameter_values)
-cccv_sol = sim.solve()
-
-# Second simulation for Charge experiment
-sim = pybamm.Simulation(model, experiment=charge_experiment, parameter_values=parameter_values)
-charge_sol = sim.solve(starting_solution=cccv_sol)
+# Build each experiment's simulation once and reuse it for every set
+campaign = AgingCampaign(
+    model,
+    parameter_values,
+    {"cccv": cccv_experiment, "charge": charge_experiment, "rpt": rpt_experiment},
+)
 
-# Third simulation for RPT experiment
-sim = pybamm.Simulation(model, experiment=rpt_experiment, parameter_values=parameter_values)
-rpt_sol = sim.solve(starting_solution=charge_sol)
+# First set of experiments (CCCV, Charge, RPT)
+first_set = campaign.run(["cccv", "charge", "rpt"])[0]
+cccv_sol, charge_sol, rpt_sol = first_set["cccv"], first_set["charge"], first_set["rpt"]
 
 # Plot last RPT cycle
 pybamm.dynamic_plot(rpt_sol.cycles[-1], ["Current [A]", "Voltage [V]"])
 pybamm.plot_summary_variables(rpt_sol)
 
 # Run multiple sets of experiments (M sets)
-cccv_sols = []
-charge_sols = []
-rpt_sols = []
 M = 5
 
-for i in range(M):
-    if i != 0:  # Skip the first set of ageing cycles because it's already been done
-        sim = pybamm.Simulation(model, experiment=cccv_experiment, parameter_values=parameter_values)
-        cccv_sol = sim.solve(starting_solution=rpt_sol)
-        sim = pybamm.Simulation(model, experiment=charge_experiment, parameter_values=parameter_values)
-        charge_sol = sim.solve(starting_solution=cccv_sol)
-        sim = pybamm.Simulation(model, experiment=rpt_experiment, parameter_values=parameter_values)
-        rpt_sol = sim.solve(starting_solution=charge_sol)
-    
-    cccv_sols.append(cccv_sol)
-    charge_sols.append(charge_sol)
-    rpt_sols.append(rpt_sol)
+# Summarise the first set, then stream the remaining sets cycle by cycle so
+# only per-cycle metrics are kept rather than every full solution
+summaries = []
+for j, name in enumerate(["cccv"] * N + ["charge", "rpt"]):
+    summary = summarise_cycle(rpt_sol.cycles[j], discharge_step=2 if name == "cccv" else None)
+    summary.update({"Cycle number": j + 1, "Experiment": name})
+    summaries.append(summary)
+
+for summary in campaign.stream(
+    ["cccv", "charge", "rpt"], sets=M - 1, starting_solution=rpt_sol, discharge_steps={"cccv": 2}
+):
+    summary["Cycle number"] += N + 2
+    summaries.append(summary)
 
 
 
 # Collect capacities for CCCV and RPT cycles
-cccv_cycles = []
-cccv_capacities = []
-rpt_cycles = []
-rpt_capacities = []
-
-for i in range(M):
-    for j in range(N):
-        cccv_cycles.append(i * (N + 2) + j + 1)
-        start_capacity = rpt_sols[i].cycles[j].steps[2]["Discharge capacity [A.h]"].entries[0]
-        end_capacity = rpt_sols[i].cycles[j].steps[2]["Discharge capacity [A.h]"].entries[-1]
-        cccv_capacities.append(end_capacity - start_capacity)
-    
-   # rpt_cycles.append((i + 1) * (N + 2))
-    start_capacity = rpt_sols[i].cycles[-1]["Discharge capacity [A.h]"].entries[0]
-    end_capacity = rpt_sols[i].cycles[-1]["Discharge capacity [A.h]"].entries[-1]
-    rpt_capacities.append(end_capacity - start_capacity)
+cccv_cycles = [s["Cycle number"] for s in summaries if s["Experiment"] == "cccv"]
+cccv_capacities = [s["Discharge capacity [A.h]"] for s in summaries if s["Experiment"] == "cccv"]
+rpt_cycles = [s["Cycle number"] for s in summaries if s["Experiment"] == "rpt"]
+rpt_capacities = [s["Discharge capacity [A.h]"] for s in summaries if s["Experiment"] == "rpt"]
 
 
 
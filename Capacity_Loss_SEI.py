@@ -1,5 +1,6 @@
 import pybamm
 import matplotlib.pyplot as plt
+from Solution_Cache import cached_variables
 model = pybamm.lithium_ion.DFN(
     {
         "SEI": "solvent-diffusion limited",
@@ -19,7 +20,7 @@ var_pts = {
     "r_p": 30,  # positive particle
 }
 cycle_number = 10
-exp = pybamm.Experiment(
+exp_steps = (
     [
         "Hold at 4.2 V until C/100 (5 minute period)",
         "Rest for 4 hours (5 minute period)",
@@ -35,16 +36,24 @@ exp = pybamm.Experiment(
         )
     ]
     * cycle_number
-    + ["Discharge at 0.1C until 2.5 V (5 minute period)"],  # final capacity check
+    + ["Discharge at 0.1C until 2.5 V (5 minute period)"]  # final capacity check
 )
 solver = pybamm.IDAKLUSolver()
-sim = pybamm.Simulation(
-    model, parameter_values=param, experiment=exp, solver=solver, var_pts=var_pts
+sol = cached_variables(
+    model,
+    param,
+    exp_steps,
+    [
+        "Throughput capacity [A.h]",
+        "Loss of capacity to negative SEI [A.h]",
+        "Loss of capacity to negative SEI on cracks [A.h]",
+    ],
+    solver=solver,
+    var_pts=var_pts,
 )
-sol = sim.solve()
-Qt = sol["Throughput capacity [A.h]"].entries
-Q_SEI = sol["Loss of capacity to negative SEI [A.h]"].entries
-Q_SEI_cr = sol["Loss of capacity to negative SEI on cracks [A.h]"].entries
+Qt = sol["Throughput capacity [A.h]"]
+Q_SEI = sol["Loss of capacity to negative SEI [A.h]"]
+Q_SEI_cr = sol["Loss of capacity to negative SEI on cracks [A.h]"]
 plt.figure()
 plt.plot(Qt, Q_SEI, label="SEI", linestyle="dashed")
 plt.plot(Qt, Q_SEI_cr, label="SEI on cracks", linestyle="dashdot")
@@ -0,0 +1,83 @@
+import os
+import pickle
+
+import numpy as np
+import pybamm
+from Aging_Campaign import AgingCampaign
+from Solution_Cache import cache_key
+from Time_Series import TimeSeriesRecorder
+
+
+# Checkpointed multi-cycle runs. The protocol is solved `every` cycles at a
+# time; after each chunk the last state and the variables collected so far
+# are written to `checkpoint_dir`, so a killed run resumes from the latest
+# checkpoint (via `starting_solution`) instead of from cycle 0. Each
+# checkpoint records the key of the run that wrote it (model, parameters,
+# protocol, chunk length, variables and solver settings); a checkpoint from a
+# different run is discarded and the run starts again from cycle 0.
+CHECKPOINT_FILE = "checkpoint.pkl"
+
+
+def load_checkpoint(checkpoint_dir):
+    """Return the latest checkpoint dict, or None if there is none."""
+    path = os.path.join(checkpoint_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def save_checkpoint(checkpoint_dir, checkpoint):
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = os.path.join(checkpoint_dir, CHECKPOINT_FILE)
+    # Write then rename, so a kill mid-write leaves the previous checkpoint
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump(checkpoint, f)
+    os.replace(path + ".tmp", path)
+
+
+def run_with_checkpoints(
+    model, parameter_values, cycle, cycles, variables, checkpoint_dir, every=10, **kwargs
+):
+    """Solve `cycle` (a tuple of step strings) `cycles` times with checkpoints.
+
+    Resumes automatically from the checkpoint in `checkpoint_dir` if it was
+    written by the same run; asking for more cycles than a checkpoint holds
+    extends it. Returns {name: entries} for `variables` over all cycles run.
+    """
+    key = cache_key(model, parameter_values, cycle, every=every, variables=list(variables), **kwargs)
+    checkpoint = load_checkpoint(checkpoint_dir)
+    if checkpoint is not None and (checkpoint.get("key") != key or checkpoint["cycles done"] > cycles):
+        pybamm.logger.warning(f"Checkpoint in {checkpoint_dir} is from a different run; starting again")
+        checkpoint = None
+    checkpoint = checkpoint or {
+        "key": key,
+        "cycles done": 0,
+        "state": None,
+        "variables": {name: np.empty(0) for name in variables},
+    }
+    recorder = TimeSeriesRecorder(variables)
+    if checkpoint["cycles done"]:
+        pybamm.logger.notice(f"Resuming from checkpoint after {checkpoint['cycles done']} cycles")
+        recorder.append(checkpoint["variables"])
+
+    # One experiment per chunk length, each built the first time it is needed
+    # and re-used. A resumed run can need lengths other than `every` and
+    # `cycles % every` (e.g. 3 of 4 cycles done in chunks of 2)
+    campaign = AgingCampaign(model, parameter_values, {}, **kwargs)
+    while checkpoint["cycles done"] < cycles:
+        n = min(every, cycles - checkpoint["cycles done"])
+        if n not in campaign.experiments:
+            campaign.experiments[n] = pybamm.Experiment([cycle] * n)
+        state = checkpoint["state"]
+        solution = campaign.solve(n, starting_solution=state)
+        # Starting from a saved state repeats that state as the first point
+        skip = 0 if state is None else len(solution.cycles[0].t)
+        recorder.append({name: solution[name].entries[skip:] for name in variables})
+        checkpoint["variables"] = recorder.as_dict()
+        checkpoint["cycles done"] += n
+        checkpoint["state"] = solution.last_state
+        save_checkpoint(checkpoint_dir, checkpoint)
+        del solution
+
+    return checkpoint["variables"]
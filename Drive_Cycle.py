@@ -0,0 +1,118 @@
+import re
+
+import numpy as np
+import pybamm
+from Aging_Campaign import declare_inputs
+from Solution_Cache import CACHE_DIR, MAX_CACHE_SIZE, cache_key, cached_arrays
+
+# Compiles a pulse pattern of fixed-duration current steps into one
+# piecewise-constant current input. The whole pattern is then solved as a
+# single segment (one model build, no per-step string parsing or solver
+# set-up), with the step boundaries passed to the solver as t_eval so it
+# restarts cleanly at every current change.
+STEP_PATTERN = re.compile(
+    r"^(?:(?P<direction>Discharge|Charge) at (?P<current>[\d.]+) ?A|(?P<rest>Rest)) "
+    r"for (?P<duration>[\d.]+) seconds?$"
+)
+
+
+def compile_steps(steps):
+    """Turn step strings into (boundary times, currents).
+
+    Only "Discharge/Charge at <x> A for <t> seconds" and "Rest for <t>
+    seconds" are supported. Returns the n + 1 step boundary times [s] and the
+    n step currents [A] (positive for discharge, as in pybamm).
+    """
+    durations = []
+    currents = []
+    for step in steps:
+        match = STEP_PATTERN.match(step.strip())
+        if match is None:
+            raise ValueError(f"Cannot compile step '{step}' into a drive cycle")
+        durations.append(float(match["duration"]))
+        if match["rest"]:
+            currents.append(0.0)
+        else:
+            sign = 1.0 if match["direction"] == "Discharge" else -1.0
+            currents.append(sign * float(match["current"]))
+    times = np.concatenate([[0.0], np.cumsum(durations)])
+    return times, np.array(currents)
+
+
+def save_drive_cycle(path, times, currents):
+    """Write a compiled drive cycle as CSV (step start time, current)."""
+    data = np.column_stack([times[:-1], currents])
+    np.savetxt(path, data, delimiter=",", header=f"Time [s],Current [A],end={times[-1]}")
+
+
+def load_drive_cycle(path):
+    """Read a drive cycle written by `save_drive_cycle` (or the same layout)."""
+    with open(path) as f:
+        header = f.readline()
+    end = float(header.rsplit("end=", 1)[1])
+    data = np.loadtxt(path, delimiter=",", ndmin=2)
+    return np.append(data[:, 0], end), data[:, 1]
+
+
+def current_function(times, currents, ramp=1e-3):
+    """Piecewise-constant current as an interpolant in time.
+
+    Each change in current is a linear ramp of `ramp` seconds ending on the
+    step boundary, since interpolation points must be strictly increasing.
+    """
+    x = np.column_stack([times[:-1], times[1:] - ramp]).ravel()
+    y = np.repeat(currents, 2)
+    x = np.append(x, times[-1])
+    y = np.append(y, currents[-1])
+    return pybamm.Interpolant(x, y, pybamm.t, name="Drive cycle current [A]", interpolator="linear")
+
+
+def solve_drive_cycle(
+    model, parameter_values, times, currents, period=None, termination=None, solver=None, inputs=None, **kwargs
+):
+    """Solve the whole drive cycle as one segment.
+
+    Outputs are interpolated every `period` seconds if given. As with
+    fixed-duration experiment steps, the upper voltage cut-off does not stop
+    the solve; it stops at the lower cut-off, which `termination` [V]
+    overrides (like an experiment's termination="1V").
+
+    `inputs` maps parameter names to values, which are passed as pybamm input
+    parameters. Given a list of such dicts, the model is built once and one
+    solution per dict is returned.
+    """
+    model = model.new_copy()
+    model.events = [event for event in model.events if not event.name.startswith("Maximum voltage")]
+    inputs_list = [inputs] if isinstance(inputs, dict) else inputs or [{}]
+    names = list(dict.fromkeys(name for point in inputs_list for name in point))
+    parameter_values, defaults = declare_inputs(parameter_values, names)
+    parameter_values["Current function [A]"] = current_function(times, currents)
+    if termination is not None:
+        parameter_values["Lower voltage cut-off [V]"] = termination
+    sim = pybamm.Simulation(model, parameter_values=parameter_values, solver=solver, **kwargs)
+    t_interp = None if period is None else np.arange(times[0], times[-1], period)
+    solutions = [
+        sim.solve(t_eval=times, t_interp=t_interp, inputs={**defaults, **point} or None) for point in inputs_list
+    ]
+    return solutions if isinstance(inputs, list) else solutions[0]
+
+
+def cached_drive_cycle(
+    model, parameter_values, times, currents, variables, cache_dir=CACHE_DIR, max_size=MAX_CACHE_SIZE, **kwargs
+):
+    """Return {name: entries} for `variables` from `solve_drive_cycle`,
+    memoised in the solution cache.
+
+    The key covers the model, parameters, drive cycle, variables and every
+    keyword argument (period, termination, solver, inputs, var_pts, ...).
+    `inputs` must be a single dict here.
+    """
+    key = cache_key(
+        model, parameter_values, [], drive_cycle=(times, currents), variables=list(variables), **kwargs
+    )
+
+    def compute():
+        solution = solve_drive_cycle(model, parameter_values, times, currents, **kwargs)
+        return {name: solution[name].entries for name in variables}
+
+    return cached_arrays(key, compute, cache_dir, max_size)
@@ -0,0 +1,40 @@
+import pybamm
+
+# Electrode state-of-health (eSOH) summary variables, computed outside the
+# solve. The eSOH problem only depends on the cycle's end state through the
+# electrode and lithium capacities (Q_n, Q_p, Q_Li, i.e. LAM_n, LAM_p and LLI),
+# so results are memoised on those; solve with calc_esoh=False and add the
+# eSOH variables afterwards with `cycles` (or `solve` for a single state).
+
+
+def esoh_inputs(cycle):
+    """(Q_n, Q_p, Q_Li) [A.h] at the end of a cycle, as pybamm uses them."""
+    last_state = cycle.last_state
+    return (
+        float(last_state["Negative electrode capacity [A.h]"].data[0]),
+        float(last_state["Positive electrode capacity [A.h]"].data[0]),
+        float(last_state["Total lithium capacity in particles [A.h]"].data[0]),
+    )
+
+
+class ESOHCache:
+    def __init__(self, model, parameter_values, significant_digits=8):
+        self.solver = pybamm.lithium_ion.ElectrodeSOHSolver(
+            parameter_values, param=model.param, options=model.options
+        )
+        self.significant_digits = significant_digits
+        self._memo = {}
+
+    def _key(self, inputs):
+        return tuple(float(f"{value:.{self.significant_digits}g}") for value in inputs)
+
+    def solve(self, Q_n, Q_p, Q_Li):
+        """eSOH variables for one state, from the memo if already solved."""
+        key = self._key((Q_n, Q_p, Q_Li))
+        if key not in self._memo:
+            self._memo[key] = self.solver.solve(inputs={"Q_n": Q_n, "Q_p": Q_p, "Q_Li": Q_Li})
+        return self._memo[key]
+
+    def cycles(self, cycles):
+        """eSOH variables for every cycle, solving each distinct state once."""
+        return [self.solve(*esoh_inputs(cycle)) for cycle in cycles]
@@ -0,0 +1,66 @@
+import numpy as np
+
+
+# Empirical fade laws shared by the R0_AH_* scripts. Every rate constant may be
+# a scalar or a 1-D array with one entry per parameter set; the laws are then
+# evaluated as a single (parameter set x cycle) broadcast.
+#
+#   SEI thickness      delta_sei_0 + k_sei * sqrt(n)
+#   R0 (SEI)           rho_sei * thickness / electrode area
+#   R0 (other)         k_*_resistance * n   (k_lli_resistance * sqrt(n))
+#   capacity loss      k_lli * sqrt(n), k_plating_capacity * n, k_crack * n, k_lam * n
+RATE_CONSTANTS = [
+    "k_sei",
+    "k_lli",
+    "k_plating_capacity",
+    "k_crack",
+    "k_lam",
+    "k_plating_resistance",
+    "k_crack_resistance",
+    "k_lam_resistance",
+    "k_lli_resistance",
+]
+
+
+def degradation(cycles, constants, initial_capacity, rho_sei, delta_sei_0, electrode_area):
+    """Evaluate capacity, R0 and per-mechanism breakdowns.
+
+    `cycles` is a cycle count or an array of cycle numbers and `constants` a
+    dict of the RATE_CONSTANTS (missing ones are zero). Returns a dict of
+    arrays of shape (parameter sets, cycles).
+    """
+    n = np.arange(1, cycles + 1) if np.isscalar(cycles) else np.asarray(cycles, dtype=float)
+    n = n[np.newaxis, :]
+    sqrt_n = np.sqrt(n)
+    k = {name: np.atleast_1d(np.asarray(constants.get(name, 0.0), dtype=float))[:, np.newaxis]
+         for name in RATE_CONSTANTS}
+    initial_capacity = np.atleast_1d(np.asarray(initial_capacity, dtype=float))[:, np.newaxis]
+    rho_sei = np.atleast_1d(np.asarray(rho_sei, dtype=float))[:, np.newaxis]
+    delta_sei_0 = np.atleast_1d(np.asarray(delta_sei_0, dtype=float))[:, np.newaxis]
+    electrode_area = np.atleast_1d(np.asarray(electrode_area, dtype=float))[:, np.newaxis]
+
+    result = {}
+    result["sei_thickness"] = delta_sei_0 + k["k_sei"] * sqrt_n
+    result["R0_sei"] = rho_sei * result["sei_thickness"] / electrode_area
+    result["R0_plating"] = k["k_plating_resistance"] * n
+    result["R0_crack"] = k["k_crack_resistance"] * n
+    result["R0_lam"] = k["k_lam_resistance"] * n
+    result["R0_lli"] = k["k_lli_resistance"] * sqrt_n
+    result["R0_total"] = (
+        result["R0_sei"] + result["R0_plating"] + result["R0_crack"] + result["R0_lam"] + result["R0_lli"]
+    )
+
+    # Capacity left if only that mechanism acted, and with all losses added
+    loss_lli = k["k_lli"] * sqrt_n
+    loss_plating = k["k_plating_capacity"] * n
+    loss_crack = k["k_crack"] * n
+    loss_lam = k["k_lam"] * n
+    result["capacity_lli"] = initial_capacity - loss_lli
+    result["capacity_plating"] = initial_capacity - loss_plating
+    result["capacity_crack"] = initial_capacity - loss_crack
+    result["capacity_lam"] = initial_capacity - loss_lam
+    result["capacity_total"] = initial_capacity - (loss_lli + loss_plating + loss_crack + loss_lam)
+
+    # Broadcast everything to the full (parameter sets, cycles) shape
+    shape = np.broadcast_shapes(*(value.shape for value in result.values()))
+    return {name: np.broadcast_to(value, shape) for name, value in result.items()}
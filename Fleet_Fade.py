@@ -0,0 +1,67 @@
+import numpy as np
+
+# Closed-form capacity fade for a fleet of cells. Each law is evaluated as one
+# (cells x cycles) broadcast; rate constants may be scalars or arrays with one
+# entry per cell (e.g. Monte Carlo samples of manufacturing variation).
+#
+#   geometric   C0 * (1 - rate) ** n      (the per-cycle loop C[n] = C[n-1] * (1 - rate))
+#   power law   C0 * (1 - k * n ** z)
+
+
+def geometric_fade(cycles, rate, initial_capacity=1.0):
+    """Capacity after each cycle for a constant fractional fade per cycle."""
+    n = np.asarray(cycles, dtype=float)
+    rate = np.asarray(rate, dtype=float).reshape(-1, 1)
+    return np.asarray(initial_capacity).reshape(-1, 1) * np.exp(n * np.log1p(-rate))
+
+
+def power_law_fade(cycles, k, z=0.5, initial_capacity=1.0):
+    """Capacity after each cycle for a fractional loss k * n ** z (z = 0.5 for SEI-like fade)."""
+    n = np.asarray(cycles, dtype=float)
+    k = np.asarray(k, dtype=float).reshape(-1, 1)
+    z = np.asarray(z, dtype=float).reshape(-1, 1)
+    return np.asarray(initial_capacity).reshape(-1, 1) * (1 - k * n**z)
+
+
+LAWS = {"geometric": geometric_fade, "power law": power_law_fade}
+
+
+def sample_rates(mean, relative_std, cells, seed=None):
+    """Lognormal per-cell samples with the given mean and relative spread."""
+    sigma = np.sqrt(np.log1p(relative_std**2))
+    rng = np.random.default_rng(seed)
+    return mean * rng.lognormal(-0.5 * sigma**2, sigma, size=cells)
+
+
+def percentile_bands(cycles, law, percentiles=(5, 50, 95), block_size=None, **parameters):
+    """Percentiles across cells of the capacity at each cycle.
+
+    `law` is a name in LAWS (or a function like them) and `parameters` its
+    per-cell arguments. Returns an array of shape (percentiles, cycles).
+
+    The LAWS are monotone in each argument, so when only one of them varies
+    between cells its percentiles map straight onto capacity percentiles and
+    no per-cell array is built. Otherwise the (cells x cycles) array is built
+    `block_size` cycles at a time (by default about 10^7 values per block),
+    so 100k-cell fleets fit in memory.
+    """
+    cycles = np.asarray(cycles)
+    varying = [name for name, value in parameters.items() if np.size(value) > 1]
+    if law in LAWS and len(varying) == 1:
+        name = varying[0]
+        order = np.argsort(percentiles)
+        values = np.percentile(parameters[name], np.asarray(percentiles)[order])
+        curves = np.sort(LAWS[law](cycles, **{**parameters, name: values}), axis=0)
+        bands = np.empty_like(curves)
+        bands[order] = curves
+        return bands
+
+    law = LAWS.get(law, law)
+    if block_size is None:
+        cells = max(np.size(value) for value in parameters.values())
+        block_size = max(1, 10**7 // cells)
+    bands = np.empty((len(percentiles), len(cycles)))
+    for start in range(0, len(cycles), block_size):
+        block = slice(start, start + block_size)
+        bands[:, block] = np.percentile(law(cycles[block], **parameters), percentiles, axis=0)
+    return bands
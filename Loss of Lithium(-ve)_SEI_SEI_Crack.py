@@ -1,5 +1,7 @@
 import pybamm
 import matplotlib.pyplot as plt
+from ESOH_Cache import ESOHCache
+from Solution_Cache import cached_variables
 
 # Define Model 2 with aging only
 model2 = pybamm.lithium_ion.DFN(
@@ -19,21 +21,44 @@ var_pts = {
     "r_n": 26,  # negative particle
     "r_p": 26,  # positive particle
 }
-exp = pybamm.Experiment(
-    ["Hold at 4.2 V until C/100", "Rest for 1 hour", "Discharge at 1C until 2.5 V"]
-)
+exp_steps = ["Hold at 4.2 V until C/100", "Rest for 1 hour", "Discharge at 1C until 2.5 V"]
 
 # Simulation with Model 2 (aging effects included)
 solver = pybamm.IDAKLUSolver()
-sim2 = pybamm.Simulation(
-    model2, parameter_values=param, experiment=exp, var_pts=var_pts, solver=solver
+sol2 = cached_variables(
+    model2,
+    param,
+    exp_steps,
+    [
+        "Time [s]",
+        "Loss of lithium to negative SEI [mol]",
+        "Loss of lithium to negative SEI on cracks [mol]",
+        "Negative electrode capacity [A.h]",
+        "Positive electrode capacity [A.h]",
+        "Total lithium capacity in particles [A.h]",
+    ],
+    solve_kwargs={"calc_esoh": False},
+    var_pts=var_pts,
+    solver=solver,
 )
-sol2 = sim2.solve(calc_esoh=False)
 
 # Extract results
-t2 = sol2["Time [s]"].entries
-SEI2 = sol2["Loss of lithium to negative SEI [mol]"].entries
-SEI_on_cracks = sol2["Loss of lithium to negative SEI on cracks [mol]"].entries
+t2 = sol2["Time [s]"]
+SEI2 = sol2["Loss of lithium to negative SEI [mol]"]
+SEI_on_cracks = sol2["Loss of lithium to negative SEI on cracks [mol]"]
+
+# eSOH is skipped during the solve (calc_esoh=False); the cell capacity at the
+# start and end of the run comes from the memoised eSOH solver instead
+esoh = ESOHCache(model2, param)
+capacities = [
+    esoh.solve(
+        sol2["Negative electrode capacity [A.h]"][i],
+        sol2["Positive electrode capacity [A.h]"][i],
+        sol2["Total lithium capacity in particles [A.h]"][i],
+    )["Capacity [A.h]"]
+    for i in (0, -1)
+]
+print(f"Capacity: {capacities[0]:.4f} A.h -> {capacities[1]:.4f} A.h")
 
 # Plot SEI formation and SEI on cracks
 plt.figure(figsize=(10, 5))
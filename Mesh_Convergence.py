@@ -0,0 +1,179 @@
+import json
+import os
+import time
+
+import numpy as np
+import pybamm
+from Solution_Cache import CACHE_DIR, cache_key, cached_arrays
+
+# Chooses var_pts for a protocol by solving it at increasing resolutions and
+# comparing key outputs with the finest one. Outputs are compared at the end
+# of every experiment step rather than on a common time grid: cut-off and CV
+# steps end at slightly different times on each mesh, and the voltage jumps
+# at those step edges would otherwise swamp the comparison. The chosen
+# var_pts are recorded in MESH_RECORD so later runs of the same protocol can
+# reuse them.
+MESH_RECORD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mesh_convergence.json")
+
+# Coarsest to finest; these span the var_pts used across the scripts
+MESH_LEVELS = [
+    {"x_n": 5, "x_s": 5, "x_p": 5, "r_n": 10, "r_p": 10},
+    {"x_n": 10, "x_s": 10, "x_p": 10, "r_n": 16, "r_p": 16},
+    {"x_n": 20, "x_s": 20, "x_p": 20, "r_n": 26, "r_p": 26},
+    {"x_n": 30, "x_s": 30, "x_p": 30, "r_n": 30, "r_p": 30},
+]
+
+# "Time [s]" and "Discharge capacity [A.h]" at the step ends capture the
+# step durations and the charge passed in each step
+OUTPUTS = [
+    "Time [s]",
+    "Discharge capacity [A.h]",
+    "Voltage [V]",
+    "Total capacity lost to side reactions [A.h]",
+    "Loss of lithium inventory [%]",
+]
+
+
+def step_ends(
+    model,
+    parameter_values,
+    steps,
+    outputs=OUTPUTS,
+    experiment_kwargs=None,
+    solve_kwargs=None,
+    cache_dir=CACHE_DIR,
+    **kwargs,
+):
+    """Value of each output at the end of every experiment step, plus the
+    wall time of the solve ("wall time [s]"), memoised on disk.
+
+    Entries run over the solved cycles and, within each, over the steps by
+    index, so the same (cycle, step) lines up across mesh levels. Steps the
+    experiment skipped as infeasible are NaN.
+
+    Extra keyword arguments (var_pts, solver, ...) go to the Simulation. The
+    recorded wall time is that of the solve that filled the cache entry, so
+    it stays meaningful when the entry is loaded later.
+    """
+    key = cache_key(
+        model, parameter_values, steps, experiment_kwargs, solve_kwargs, step_ends=list(outputs), **kwargs
+    )
+
+    def compute():
+        experiment = pybamm.Experiment(steps, **(experiment_kwargs or {}))
+        sim = pybamm.Simulation(model, experiment=experiment, parameter_values=parameter_values, **kwargs)
+        start = time.perf_counter()
+        solution = sim.solve(**(solve_kwargs or {}))
+        wall_time = time.perf_counter() - start
+        ends = [step for cycle in solution.cycles for step in cycle.steps]
+        arrays = {
+            name: np.array(
+                [np.nan if isinstance(step, pybamm.EmptySolution) else step[name].entries[-1] for step in ends]
+            )
+            for name in outputs
+        }
+        arrays["wall time [s]"] = np.array(wall_time)
+        return arrays
+
+    return cached_arrays(key, compute, cache_dir)
+
+
+def _error(values, reference):
+    # Max deviation from the reference over the step ends, relative to the
+    # reference's magnitude (absolute if the reference is identically zero).
+    # A run that stopped after a different number of steps, or skipped a step
+    # the reference solved (or the other way round), never matches.
+    if len(values) != len(reference):
+        return float("inf")
+    skipped = np.isnan(reference)
+    if np.any(np.isnan(values) != skipped):
+        return float("inf")
+    deviation = np.max(np.abs(values - reference)[~skipped], initial=0.0)
+    scale = np.max(np.abs(reference)[~skipped], initial=0.0)
+    return float(deviation / scale) if scale > 0 else float(deviation)
+
+
+def select_var_pts(
+    model,
+    parameter_values,
+    steps,
+    tolerance=1e-3,
+    outputs=OUTPUTS,
+    levels=MESH_LEVELS,
+    record=MESH_RECORD,
+    **kwargs,
+):
+    """Return the cheapest var_pts in `levels` whose outputs are within
+    `tolerance` (relative) of the finest level, and record the result.
+
+    Outputs are compared at the end of every experiment step (see
+    `step_ends`). Extra keyword arguments are passed to `step_ends`.
+    """
+    runs = []
+    for var_pts in levels:
+        ends = step_ends(model, parameter_values, steps, outputs, var_pts=var_pts, **kwargs)
+        runs.append({"var_pts": var_pts, "wall time [s]": float(ends["wall time [s]"]), "variables": ends})
+
+    reference = runs[-1]["variables"]
+    for run in runs:
+        run["errors"] = {name: _error(run["variables"][name], reference[name]) for name in outputs}
+    chosen = next(run for run in runs if max(run["errors"].values()) <= tolerance)
+
+    if record is not None:
+        key = cache_key(model, parameter_values, steps, **kwargs)
+        history = {}
+        if os.path.exists(record):
+            with open(record) as f:
+                history = json.load(f)
+        history[key] = {
+            "tolerance": tolerance,
+            "var_pts": chosen["var_pts"],
+            "levels": [{k: v for k, v in run.items() if k != "variables"} for run in runs],
+        }
+        with open(record, "w") as f:
+            json.dump(history, f, indent=2)
+    return chosen["var_pts"]
+
+
+def recorded_var_pts(model, parameter_values, steps, default=None, record=MESH_RECORD, **kwargs):
+    """Return the var_pts previously chosen for this protocol, or `default`."""
+    if not os.path.exists(record):
+        return default
+    with open(record) as f:
+        history = json.load(f)
+    entry = history.get(cache_key(model, parameter_values, steps, **kwargs))
+    return default if entry is None else entry["var_pts"]
+
+
+if __name__ == "__main__":
+    # Convergence study for the Capacity_Loss_SEI.py protocol
+    model = pybamm.lithium_ion.DFN(
+        {
+            "SEI": "solvent-diffusion limited",
+            "SEI porosity change": "true",
+            "particle mechanics": ("swelling and cracking", "swelling only"),
+            "SEI on cracks": "true",
+        }
+    )
+    param = pybamm.ParameterValues("OKane2022")
+    cycle_number = 10
+    exp_steps = (
+        [
+            "Hold at 4.2 V until C/100 (5 minute period)",
+            "Rest for 4 hours (5 minute period)",
+            "Discharge at 0.1C until 2.5 V (5 minute period)",
+            "Charge at 0.3C until 4.2 V (5 minute period)",
+            "Hold at 4.2 V until C/100 (5 minute period)",
+        ]
+        + [
+            (
+                "Discharge at 1C until 2.5 V (1 minute period)",
+                "Charge at 0.3C until 4.2 V (5 minute period)",
+                "Hold at 4.2 V until C/100 (5 minute period)",
+            )
+        ]
+        * cycle_number
+        + ["Discharge at 0.1C until 2.5 V (5 minute period)"]
+    )
+    var_pts = select_var_pts(model, param, exp_steps, tolerance=1e-3, solver=pybamm.IDAKLUSolver())
+    print(f"Chosen var_pts: {var_pts}")
@@ -0,0 +1,48 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pybamm
+from Solution_Cache import cached_variables
+
+
+# Solves the same experiment for several model option sets in parallel worker
+# processes (through the solution cache) and interpolates the outputs onto a
+# common time grid, so a comparison costs about the slowest solve rather than
+# the sum of all of them.
+
+
+def solve_model(model, options, parameter_set, steps, variables, overrides=None, **kwargs):
+    """Solve one option set in a worker; variables the model lacks are left out."""
+    model = getattr(pybamm.lithium_ion, model)(options)
+    parameter_values = pybamm.ParameterValues(parameter_set)
+    parameter_values.update(overrides or {})
+    names = ["Time [s]"] + [name for name in variables if name in model.variables]
+    return cached_variables(model, parameter_values, steps, names, **kwargs)
+
+
+def compare_models(
+    options_list, parameter_set, steps, variables, model="DFN", overrides=None, max_workers=None, **kwargs
+):
+    """Return one {name: array} per option set, all on the same "Time [s]".
+
+    The grid is the union of every run's output times; a run's values past
+    its own final time are NaN. Extra keyword arguments go to
+    `cached_variables` (var_pts, solve_kwargs, ...). Scripts calling this
+    must guard it with `if __name__ == "__main__":`.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(solve_model, model, options, parameter_set, steps, variables, overrides, **kwargs)
+            for options in options_list
+        ]
+        results = [future.result() for future in futures]
+
+    time = np.unique(np.concatenate([result["Time [s]"] for result in results]))
+    aligned = []
+    for result in results:
+        outputs = {"Time [s]": time}
+        for name, values in result.items():
+            if name != "Time [s]":
+                outputs[name] = np.interp(time, result["Time [s]"], values, right=np.nan)
+        aligned.append(outputs)
+    return aligned
@@ -0,0 +1,83 @@
+import json
+import os
+from importlib import metadata
+
+# Scalar parameter lookup without importing pybamm. The numeric entries of the
+# parameter sets the scripts use are precompiled into parameter_constants.json
+# (keyed by pybamm version); pybamm is only imported to rebuild that file, to
+# look up a non-scalar entry, or to get full ParameterValues for a simulation.
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parameter_constants.json")
+PARAMETER_SETS = ["Chen2020", "OKane2022"]
+
+_constants = None
+
+
+def build_cache(parameter_sets=PARAMETER_SETS, path=CACHE_FILE):
+    """Recompile the constants file from pybamm's parameter sets."""
+    import numbers
+
+    import pybamm
+
+    cache = {"pybamm": pybamm.__version__, "sets": {}}
+    for name in parameter_sets:
+        parameter_values = pybamm.ParameterValues(name)
+        cache["sets"][name] = {
+            key: float(value)
+            for key, value in parameter_values.items()
+            if isinstance(value, numbers.Number) and not isinstance(value, bool)
+        }
+    with open(path + ".tmp", "w") as f:
+        json.dump(cache, f, indent=1)
+    os.replace(path + ".tmp", path)
+    return cache
+
+
+def constants(parameter_set="Chen2020"):
+    """{name: value} of every scalar parameter in a set.
+
+    The file is rebuilt if it is missing, was written by another pybamm
+    version, or lacks the set.
+    """
+    global _constants
+    if _constants is None and os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE) as f:
+            _constants = json.load(f)
+    try:
+        version = metadata.version("pybamm")
+    except metadata.PackageNotFoundError:
+        version = None
+    if (
+        _constants is None
+        or (version is not None and _constants["pybamm"] != version)
+        or parameter_set not in _constants["sets"]
+    ):
+        sets = PARAMETER_SETS if _constants is None else list(_constants["sets"])
+        _constants = build_cache(list(dict.fromkeys(sets + [parameter_set])))
+    return _constants["sets"][parameter_set]
+
+
+def lookup(parameter_set, *names):
+    """Values of the named parameters (a single value if one name is given).
+
+    Names that are not scalars (functions, interpolants) come from pybamm.
+    """
+    values = constants(parameter_set)
+    missing = [name for name in names if name not in values]
+    if missing:
+        full = parameter_values(parameter_set)
+        values = {**values, **{name: full[name] for name in missing}}
+    result = [values[name] for name in names]
+    return result[0] if len(names) == 1 else result
+
+
+def electrode_area(parameter_set="Chen2020"):
+    """Electrode width x height [m2]."""
+    width, height = lookup(parameter_set, "Electrode width [m]", "Electrode height [m]")
+    return width * height
+
+
+def parameter_values(parameter_set="Chen2020"):
+    """Full pybamm.ParameterValues, for when a simulation is actually run."""
+    import pybamm
+
+    return pybamm.ParameterValues(parameter_set)
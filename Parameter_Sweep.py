@@ -0,0 +1,181 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pybamm
+from Aging_Campaign import AgingCampaign, summarise_cycle
+
+
+# Fans one aging campaign out over a grid of parameter overrides on a process
+# pool. Models and solutions are not sent between processes: each worker
+# rebuilds the campaign from a plain `spec` dict and only sends back the
+# per-cycle summaries from AgingCampaign.stream.
+#
+# spec = {
+#     "model": "DFN",                                   # pybamm.lithium_ion class
+#     "options": {"SEI": "ec reaction limited"},
+#     "parameter_set": "Chen2020",
+#     "experiments": {"cccv": [(...step strings...)] * N, ...},
+#     "sequence": ["cccv", "charge"],
+#     "sets": 5,
+#     "discharge_steps": {"cccv": 2},                   # optional
+#     "var_pts": {...},                                 # optional
+#     "screening": {"max C-rate": 2.0},                 # optional, see SCREENING
+# }
+
+# Tiered runs first solve each grid point with this reduced model and the same
+# options, and switch to spec["model"] as soon as a cycle exceeds a limit
+SCREENING = {
+    "model": "SPMe",
+    "max C-rate": 1.0,
+    # (max - min) / mean of the electrolyte concentration over a cycle. The
+    # repo's 1C CCCV protocol on Chen2020 reaches about 1.6 with SPMe, so 2.0
+    # lets it pass and escalates only harsher protocols
+    "max electrolyte variation": 2.0,
+}
+
+
+def parameter_grid(values):
+    """Expand {parameter name: [values]} into a list of override dicts."""
+    names = list(values)
+    return [dict(zip(names, combination)) for combination in itertools.product(*values.values())]
+
+
+def build_campaign(spec, overrides=None, inputs=None):
+    model = getattr(pybamm.lithium_ion, spec["model"])(spec.get("options"))
+    parameter_values = pybamm.ParameterValues(spec["parameter_set"])
+    parameter_values.update(overrides or {})
+    experiments = {
+        name: pybamm.Experiment(steps) for name, steps in spec["experiments"].items()
+    }
+    return AgingCampaign(model, parameter_values, experiments, var_pts=spec.get("var_pts"), inputs=inputs)
+
+
+def run_case(spec, overrides):
+    """Run one grid point and return its list of per-cycle summaries."""
+    campaign = build_campaign(spec, overrides)
+    return list(
+        campaign.stream(
+            spec["sequence"], sets=spec.get("sets", 1), discharge_steps=spec.get("discharge_steps")
+        )
+    )
+
+
+def screening_summary(cycle, discharge_step=None):
+    """`summarise_cycle` plus the indicators used to escalate a tiered run."""
+    summary = summarise_cycle(cycle, discharge_step)
+    summary["Max C-rate"] = float(np.max(np.abs(cycle["C-rate"].entries)))
+    c_e = cycle["Electrolyte concentration [mol.m-3]"].entries
+    summary["Electrolyte variation"] = float((c_e.max() - c_e.min()) / c_e.mean())
+    return summary
+
+
+def run_tiered_case(spec, overrides):
+    """Run one grid point on the reduced model, escalating if it is not enough.
+
+    Summaries are checked as they are streamed, so an escalated point stops
+    the reduced run at the first cycle over a limit. Each summary records the
+    model it came from under "Model".
+    """
+    screening = dict(SCREENING, **spec.get("screening", {}))
+    campaign = build_campaign(dict(spec, model=screening["model"]), overrides)
+    model = screening["model"]
+    summaries = []
+    for summary in campaign.stream(
+        spec["sequence"],
+        sets=spec.get("sets", 1),
+        discharge_steps=spec.get("discharge_steps"),
+        summarise=screening_summary,
+    ):
+        if (
+            summary["Max C-rate"] > screening["max C-rate"]
+            or summary["Electrolyte variation"] > screening["max electrolyte variation"]
+        ):
+            summaries = run_case(spec, overrides)
+            model = spec["model"]
+            break
+        summaries.append(summary)
+    for summary in summaries:
+        summary["Model"] = model
+    return summaries
+
+
+def sweep(spec, grid, max_workers=None, tiered=False):
+    """Run every override dict in `grid` in parallel (all cores by default).
+
+    With `tiered=True` each point is screened on the reduced model first
+    (see SCREENING). Returns a list of (overrides, summaries) pairs in grid
+    order. Scripts calling this must guard it with `if __name__ == "__main__":`.
+    """
+    run = run_tiered_case if tiered else run_case
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(run, [spec] * len(grid), grid))
+    return list(zip(grid, results))
+
+
+def run_input_cases(spec, overrides, points, inputs):
+    """Run grid points sharing `overrides` on one campaign, varying only `inputs`.
+
+    Returns one list of per-cycle summaries per point.
+    """
+    campaign = build_campaign(spec, overrides, inputs=inputs)
+    return [
+        list(
+            campaign.stream(
+                spec["sequence"],
+                sets=spec.get("sets", 1),
+                discharge_steps=spec.get("discharge_steps"),
+                inputs={name: point[name] for name in inputs if name in point},
+            )
+        )
+        for point in points
+    ]
+
+
+def input_sweep(spec, grid, inputs, max_workers=None):
+    """Like `sweep`, with the parameters named in `inputs` as pybamm inputs.
+
+    Points that differ only in those are split over the workers, and each
+    worker builds its campaign once and re-solves it per point, so a point
+    costs a solve rather than a rebuild. Other parameters in the grid (e.g.
+    "Ambient temperature [K]", which experiments cannot take as an input)
+    still cost one build per distinct value per worker. Returns (overrides,
+    summaries) pairs in grid order. Scripts calling this must guard it with
+    `if __name__ == "__main__":`.
+    """
+    groups = {}
+    for index, point in enumerate(grid):
+        overrides = tuple((name, value) for name, value in point.items() if name not in inputs)
+        groups.setdefault(overrides, []).append(index)
+    workers = max_workers or os.cpu_count()
+    chunks = [
+        (dict(overrides), indices[i::workers])
+        for overrides, indices in groups.items()
+        for i in range(min(workers, len(indices)))
+    ]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        chunk_results = pool.map(
+            run_input_cases,
+            [spec] * len(chunks),
+            [overrides for overrides, _ in chunks],
+            [[grid[index] for index in indices] for _, indices in chunks],
+            [inputs] * len(chunks),
+        )
+        results = {}
+        for (_, indices), summaries in zip(chunks, chunk_results):
+            results.update(zip(indices, summaries))
+    return [(point, results[index]) for index, point in enumerate(grid)]
+
+
+def compare_protocols(spec, variants, overrides=None, max_workers=None):
+    """Run `spec` once per protocol variant, all variants in parallel.
+
+    `variants` maps a label to the experiments ({name: steps}) that replace
+    those in `spec`. Returns {label: summaries}. Scripts calling this must
+    guard it with `if __name__ == "__main__":`.
+    """
+    specs = [dict(spec, experiments=dict(spec["experiments"], **experiments)) for experiments in variants.values()]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(run_case, specs, [overrides or {}] * len(specs)))
+    return dict(zip(variants, results))
@@ -0,0 +1,130 @@
+import json
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pybamm
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Per-stage wall time and peak RSS for simulation runs. While a RunProfiler is
+# active, the pybamm methods below are wrapped so every call is timed under
+# its stage. Times are exclusive (solver setup inside a step is not counted
+# as integration too), and "RSS growth" is how much the process peak RSS rose
+# during the stage, which shows which stage sets the peak. Integration is also
+# broken down by experiment step. Each run is written as one JSON line.
+STAGES = {
+    "model build": [(pybamm.BaseModel, "build_model"), (pybamm.BaseBatteryModel, "build_model")],
+    "parameter processing": [
+        (pybamm.ParameterValues, "process_model"),
+        (pybamm.ParameterValues, "process_geometry"),
+    ],
+    "discretisation": [(pybamm.Mesh, "__init__"), (pybamm.Discretisation, "process_model")],
+    "solver setup": [(pybamm.BaseSolver, "set_up"), (pybamm.IDAKLUSolver, "set_up")],
+    "integration": [(pybamm.BaseSolver, "solve"), (pybamm.BaseSolver, "step")],
+    "post-processing": [(pybamm.Solution, "update"), (pybamm.ProcessedVariable, "initialise")],
+}
+
+
+def peak_rss():
+    """Peak resident set size of this process so far [MB], or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class RunProfiler:
+    def __init__(self, name, path=None):
+        self.name = name
+        self.path = path
+        self.report = None
+        self._stages = {}
+        self._steps = {}
+        self._stack = []
+        self._patches = []
+        self._step = None
+
+    def _record(self, table, key, elapsed, rss_before, rss_after):
+        entry = table.setdefault(
+            key, {"calls": 0, "wall time [s]": 0.0, "peak RSS [MB]": None, "RSS growth [MB]": 0.0}
+        )
+        entry["calls"] += 1
+        entry["wall time [s]"] += elapsed
+        if rss_after is not None:
+            entry["peak RSS [MB]"] = max(entry["peak RSS [MB]"] or 0.0, rss_after)
+            entry["RSS growth [MB]"] += rss_after - rss_before
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block as `name`; pybamm calls inside it count as their own stages."""
+        frame = {"children": 0.0}
+        self._stack.append(frame)
+        rss_before = peak_rss()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1]["children"] += elapsed
+            rss_after = peak_rss()
+            self._record(self._stages, name, elapsed - frame["children"], rss_before, rss_after)
+            if name == "integration" and self._step is not None:
+                self._record(self._steps, self._step, elapsed - frame["children"], rss_before, rss_after)
+
+    def _wrap(self, stage, function):
+        profiler = self
+
+        def wrapper(*args, **kwargs):
+            with profiler.stage(stage):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    def _patch(self, owner, attribute, replacement):
+        self._patches.append((owner, attribute, owner.__dict__[attribute]))
+        setattr(owner, attribute, replacement)
+
+    def __enter__(self):
+        for stage, targets in STAGES.items():
+            for owner, attribute in targets:
+                if attribute in owner.__dict__:
+                    self._patch(owner, attribute, self._wrap(stage, owner.__dict__[attribute]))
+
+        # Label integration with the experiment step being solved
+        on_step_start = pybamm.callbacks.CallbackList.on_step_start
+
+        def track_step(callbacks, logs):
+            self._step = logs["step operating conditions"]
+            return on_step_start(callbacks, logs)
+
+        self._patch(pybamm.callbacks.CallbackList, "on_step_start", track_step)
+        self._started = datetime.now(timezone.utc).isoformat()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall_time = time.perf_counter() - self._start
+        for owner, attribute, original in reversed(self._patches):
+            setattr(owner, attribute, original)
+        self._patches = []
+        self.report = {
+            "run": self.name,
+            "started": self._started,
+            "wall time [s]": wall_time,
+            "peak RSS [MB]": peak_rss(),
+            "stages": self._stages,
+            "other Python [s]": wall_time - sum(entry["wall time [s]"] for entry in self._stages.values()),
+            "integration by step": self._steps,
+        }
+        if self.path is not None:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(self.report) + "\n")
+        return False
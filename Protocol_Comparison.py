@@ -0,0 +1,71 @@
+import csv
+
+import matplotlib.pyplot as plt
+from Parameter_Sweep import compare_protocols
+from Result_Store import ResultStore
+
+# Same model and protocol as AGING_EFFECT(AH_LLI_LAM).py
+N = 10  # Number of repetitions in CCCV experiment
+M = 5  # Number of aging sets
+spec = {
+    "model": "DFN",
+    "options": {"SEI": "ec reaction limited"},
+    "parameter_set": "Chen2020",
+    "experiments": {
+        "charge": [("Charge at 1C until 4.2V", "Hold at 4.2V until C/100")],
+    },
+    "sequence": ["cccv", "charge"],
+    "sets": M,
+    "discharge_steps": {"cccv": 0},  # step 0 of each cycle is the discharge
+}
+overrides = {"SEI kinetic rate constant [m.s-1]": 1e-14}
+
+
+def cccv(discharge):
+    return {
+        "cccv": [
+            (
+                discharge,
+                "Charge at 0.3C until 4.2V (3 minute period)",
+                "Hold at 4.2V until C/100 (3 minute period)",
+            )
+        ]
+        * N
+    }
+
+
+# Protocol variants (previously run one at a time by editing the script)
+variants = {
+    "1C, 2.5 V cut-off": cccv("Discharge at 1C until 2.5V"),
+    "0.5C, 2.5 V cut-off": cccv("Discharge at 0.5C until 2.5V"),
+    "1C, 3.0 V cut-off": cccv("Discharge at 1C until 3V"),
+}
+
+if __name__ == "__main__":
+    results = compare_protocols(spec, variants, overrides)
+
+    # Archive the per-cycle summaries so they can be queried without re-simulating
+    store = ResultStore("aging_results")
+    for label, summaries in results.items():
+        store.append(dict(overrides, script="Protocol_Comparison", protocol=label), summaries)
+
+    # Single capacity-fade dataset for all variants
+    with open("AGING_CHEN2020_COMPARISON.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Protocol", "Cycle number", "Discharge capacity [A.h]"])
+        for label, summaries in results.items():
+            capacities = [s["Discharge capacity [A.h]"] for s in summaries if s["Experiment"] == "cccv"]
+            for cycle, capacity in enumerate(capacities, start=1):
+                writer.writerow([label, cycle, capacity])
+
+    # Overlaid capacity fade
+    plt.figure(figsize=(8, 5))
+    for label, summaries in results.items():
+        capacities = [s["Discharge capacity [A.h]"] for s in summaries if s["Experiment"] == "cccv"]
+        plt.plot(range(1, len(capacities) + 1), capacities, label=label)
+    plt.xlabel("Cycle number")
+    plt.ylabel("Discharge capacity [A.h]")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig("AGING_CHEN2020_COMPARISON.png")
+    plt.show()
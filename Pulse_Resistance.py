@@ -0,0 +1,47 @@
+import numpy as np
+
+# Pulse-based internal resistance (DCIR). Instead of dividing (OCV - V) by the
+# current at every sample, R0 is taken at each current step edge as
+# -dV / dI between the samples either side of the edge, which is well defined
+# wherever the current actually changes (including steps out of rest). pybamm
+# experiment solutions repeat the boundary time between steps, so the two
+# samples straddle the edge instantaneously and dV / dI is the ohmic part.
+
+
+def find_current_steps(current, min_step=None):
+    """Indices i where the current changes by more than `min_step` [A]
+    between samples i and i + 1 (default: 10% of the peak current), so the
+    gradual decay of a CV hold is not mistaken for a step."""
+    current = np.asarray(current, dtype=float)
+    if min_step is None:
+        min_step = 0.1 * np.max(np.abs(current))
+    return np.flatnonzero(np.abs(np.diff(current)) > min_step)
+
+
+def pulse_resistance(time, voltage, current, min_step=None):
+    """Return (edge times, R0 [Ohm]) for every current step edge.
+
+    Uses pybamm's sign convention (positive current is discharge), so a
+    step up in discharge current drops the voltage and R0 = -dV / dI > 0.
+    All edges are handled in one NumPy pass.
+    """
+    time, voltage, current = (np.asarray(a, dtype=float) for a in (time, voltage, current))
+    edges = find_current_steps(current, min_step)
+    dV = voltage[edges + 1] - voltage[edges]
+    dI = current[edges + 1] - current[edges]
+    return time[edges + 1], -dV / dI
+
+
+def resistance_per_cycle(time, voltage, current, cycle_starts, min_step=None):
+    """Mean edge resistance of each cycle, as an array with one entry per cycle.
+
+    `cycle_starts` are the start times of the cycles (e.g. each cycle's
+    first time point). Cycles without a current step get NaN.
+    """
+    edge_times, R0 = pulse_resistance(time, voltage, current, min_step)
+    cycle = np.searchsorted(cycle_starts, edge_times, side="right") - 1
+    n = len(cycle_starts)
+    count = np.bincount(cycle, minlength=n)
+    total = np.bincount(cycle, weights=R0, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
@@ -1,21 +1,23 @@
 import pybamm
 import numpy as np
 import matplotlib.pyplot as plt
+from Empirical_Degradation import degradation
+from Solution_Cache import LazySolution
 
 # Define experiment with high C-rate and low temperature
 cycles = 1200
-experiment = pybamm.Experiment([
+experiment_steps = [
     "Charge at 3C until 90% SOC at 0°C",
     "Discharge at 3C until 30% SOC at 0°C"
-] * cycles)
+] * cycles
 
 # Load model and parameters
 model = pybamm.lithium_ion.SPM()
 param = pybamm.ParameterValues("Chen2020")
-sim = pybamm.Simulation(model, experiment=experiment, parameter_values=param)
 
-# Solve the experiment (optional: not used for degradation plots here)
-solution = sim.solve()
+# Solve the experiment lazily (not used for degradation plots here): the solve
+# only runs, or is loaded from the disk cache, if a solution variable is read
+solution = LazySolution(model, param, experiment_steps)
 
 # Constants for degradation modeling
 rho_sei = param["SEI resistivity [Ohm.m]"]
@@ -43,21 +45,26 @@ k_lli_resistance = 5e-8
 # Cycle index
 cycle_numbers = np.arange(1, cycles + 1)
 
-# Resistance over cycles
-sei_thickness = delta_sei_0 + k_sei * np.sqrt(cycle_numbers)
-R0_sei = (rho_sei * sei_thickness) / electrode_area
-R0_total = R0_sei \
-         + k_plating_resistance * cycle_numbers \
-         + k_crack_resistance * cycle_numbers \
-         + k_lam_resistance * cycle_numbers \
-         + k_lli_resistance * np.sqrt(cycle_numbers)
+# Resistance and capacity degradation over cycles
+result = degradation(
+    cycle_numbers,
+    {
+        "k_sei": k_sei,
+        "k_lli": k_lli,
+        "k_plating_capacity": k_plating_capacity,
+        "k_crack": k_crack,
+        "k_lam": k_lam,
+        "k_plating_resistance": k_plating_resistance,
+        "k_crack_resistance": k_crack_resistance,
+        "k_lam_resistance": k_lam_resistance,
+        "k_lli_resistance": k_lli_resistance,
+    },
+    initial_capacity_ah, rho_sei, delta_sei_0, electrode_area,
+)
+R0_total = result["R0_total"][0]
 
 # Capacity degradation (%)
-capacity_total = initial_capacity_ah \
-    - k_lli * np.sqrt(cycle_numbers) \
-    - k_plating_capacity * cycle_numbers \
-    - k_crack * cycle_numbers \
-    - k_lam * cycle_numbers
+capacity_total = result["capacity_total"][0]
 capacity_percentage = (capacity_total / initial_capacity_ah) * 100
 
 # Simplified SOC profile vs cycles (alternating 90% ↔ 30%)
@@ -1,12 +1,11 @@
-import pybamm 
 import numpy as np
 import matplotlib.pyplot as plt
+from Empirical_Degradation import degradation
+from Parameter_Lookup import electrode_area as area, lookup
 
-# Load Chen2020 parameters
-params = pybamm.ParameterValues("Chen2020")
-rho_sei = params["SEI resistivity [Ohm.m]"]
-delta_sei_0 = params["Initial SEI thickness [m]"]
-electrode_area = params["Electrode width [m]"] * params["Electrode height [m]"]
+# Chen2020 parameters
+rho_sei, delta_sei_0 = lookup("Chen2020", "SEI resistivity [Ohm.m]", "Initial SEI thickness [m]")
+electrode_area = area("Chen2020")
 
 # Simulation settings
 cycles = 1200
@@ -26,25 +25,31 @@ k_crack_resistance = 1e-6  # Ohm per cycle
 k_lam_resistance = 0.5e-6  # Ohm per cycle
 k_lli_resistance = 1e-6  # small resistance growth due to loss of active Li
 
-# Individual degradation contributions
-sei_thickness = delta_sei_0 + k_sei * np.sqrt(cycle_numbers)
-R0_sei = (rho_sei * sei_thickness) / electrode_area
-R0_plating = k_plating_resistance * cycle_numbers
-R0_crack = k_crack_resistance * cycle_numbers
-R0_lam = k_lam_resistance * cycle_numbers
-R0_lli = k_lli_resistance * np.sqrt(cycle_numbers)
-
-R0_total = R0_sei + R0_plating + R0_crack + R0_lam + R0_lli
+# Individual degradation contributions (assuming additive losses)
+result = degradation(
+    cycle_numbers,
+    {
+        "k_sei": k_sei,
+        "k_lli": k_lli,
+        "k_plating_capacity": k_plating_capacity,
+        "k_crack": k_crack,
+        "k_lam": k_lam,
+        "k_plating_resistance": k_plating_resistance,
+        "k_crack_resistance": k_crack_resistance,
+        "k_lam_resistance": k_lam_resistance,
+        "k_lli_resistance": k_lli_resistance,
+    },
+    initial_capacity_ah, rho_sei, delta_sei_0, electrode_area,
+)
+R0_sei, R0_plating, R0_crack, R0_lam, R0_lli, R0_total = (
+    result[name][0] for name in ["R0_sei", "R0_plating", "R0_crack", "R0_lam", "R0_lli", "R0_total"]
+)
 
 # Capacity degradation
-capacity_lli = initial_capacity_ah - k_lli * np.sqrt(cycle_numbers)
-capacity_plating = initial_capacity_ah - k_plating_capacity * cycle_numbers
-capacity_crack = initial_capacity_ah - k_crack * cycle_numbers
-capacity_lam = initial_capacity_ah - k_lam * cycle_numbers
-
-# Total capacity loss (assuming additive losses)
-capacity_total = capacity_lli + (capacity_plating - initial_capacity_ah) \
-                 + (capacity_crack - initial_capacity_ah) + (capacity_lam - initial_capacity_ah)
+capacity_lli, capacity_plating, capacity_crack, capacity_lam, capacity_total = (
+    result[name][0]
+    for name in ["capacity_lli", "capacity_plating", "capacity_crack", "capacity_lam", "capacity_total"]
+)
 
 # Plotting
 fig, ax = plt.subplots(1, 2, figsize=(14, 6))
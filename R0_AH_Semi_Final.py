@@ -1,12 +1,11 @@
-import pybamm
 import numpy as np
 import matplotlib.pyplot as plt
+from Empirical_Degradation import degradation
+from Parameter_Lookup import electrode_area as area, lookup
 
-# Load Chen2020 parameters
-params = pybamm.ParameterValues("Chen2020")
-rho_sei = params["SEI resistivity [Ohm.m]"]
-delta_sei_0 = params["Initial SEI thickness [m]"]
-electrode_area = params["Electrode width [m]"] * params["Electrode height [m]"]
+# Chen2020 parameters
+rho_sei, delta_sei_0 = lookup("Chen2020", "SEI resistivity [Ohm.m]", "Initial SEI thickness [m]")
+electrode_area = area("Chen2020")
 
 # Simulation settings
 cycles = 11000
@@ -24,14 +23,23 @@ k_plating_capacity = 1e-4  # capacity loss per cycle (linear)
 k_plating_resistance = 2e-6  # Ohm increase per cycle
 
 # Track values
-sei_thickness = delta_sei_0 + k_sei * np.sqrt(cycle_numbers)
-R0_sei = (rho_sei * sei_thickness) / electrode_area
-R0_plating = k_plating_resistance * cycle_numbers
-R0_total = R0_sei + R0_plating
-
-capacity_lli = initial_capacity - k_lli * np.sqrt(cycle_numbers)
-capacity_plating = initial_capacity - k_plating_capacity * cycle_numbers
-capacity_total = capacity_lli + (capacity_plating - initial_capacity)
+result = degradation(
+    cycle_numbers,
+    {
+        "k_sei": k_sei,
+        "k_lli": k_lli,
+        "k_plating_capacity": k_plating_capacity,
+        "k_plating_resistance": k_plating_resistance,
+    },
+    initial_capacity, rho_sei, delta_sei_0, electrode_area,
+)
+R0_sei = result["R0_sei"][0]
+R0_plating = result["R0_plating"][0]
+R0_total = result["R0_total"][0]
+
+capacity_lli = result["capacity_lli"][0]
+capacity_plating = result["capacity_plating"][0]
+capacity_total = result["capacity_total"][0]
 
 # Plotting
 fig, ax = plt.subplots(1, 2, figsize=(13, 5))
@@ -1,6 +1,7 @@
 import pybamm
 import numpy as np
 import matplotlib.pyplot as plt
+from Pulse_Resistance import resistance_per_cycle
 
 # Define the battery model with SEI growth (reaction-limited)
 model = pybamm.lithium_ion.DFN(
@@ -25,28 +26,21 @@ experiment = pybamm.Experiment([
 sim = pybamm.Simulation(model, parameter_values=param, experiment=experiment)
 solution = sim.solve()
 
-# Extract internal resistance from simulation results
-time = solution["Time [h]"].entries
+# Extract internal resistance from simulation results: R0 = -dV/dI at every
+# current step edge, averaged per cycle (no per-sample division by current)
+time = solution["Time [s]"].entries
 current = solution["Current [A]"].entries
 terminal_voltage = solution["Terminal voltage [V]"].entries
-ocv = 5 V
+# Each repetition of the protocol is 4 experiment cycles (charge, rest, discharge, rest)
+cycle_starts = [cycle.t[0] for cycle in solution.cycles[::4]]
+internal_resistance = resistance_per_cycle(time, terminal_voltage, current, cycle_starts)
+cycle_numbers = np.arange(1, len(cycle_starts) + 1)
 
-# Avoid calculating resistance during rest periods (when current is near zero)
-epsilon = 1e-6  # Small threshold to avoid division by zero
-safe_current = np.where(np.abs(current) < epsilon, np.nan, current)  # Set rest periods to NaN
-
-# Calculate internal resistance (Ohm's law: R_internal = (OCV - V_terminal) / Current)
-internal_resistance = np.abs((ocv - terminal_voltage) / safe_current)
-
-# Replace NaN values with an appropriate replacement (e.g., interpolate or fill)
-internal_resistance = np.nan_to_num(internal_resistance, nan=np.nanmedian(internal_resistance))
-
-# Plot internal resistance growth over time
+# Plot internal resistance growth over cycles
 plt.figure(figsize=(8,5))
-plt.plot(time, internal_resistance * 1000)  # Convert to milliohms (mΩ)
-plt.xlabel("Time [hours]")
+plt.plot(cycle_numbers, internal_resistance * 1000)  # Convert to milliohms (mΩ)
+plt.xlabel("Cycle number")
 plt.ylabel("Internal Resistance [mΩ]")
 plt.title("Internal Resistance Growth due to SEI Formation")
 plt.grid(True)
 plt.show()
-
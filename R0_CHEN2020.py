@@ -1,6 +1,7 @@
 import pybamm
 import numpy as np
 import matplotlib.pyplot as plt
+from Thermal_Runaway import RunawayCallback, add_runaway_events, runaway_detected
 
 # 1. Define model with degradation mechanisms
 model = pybamm.lithium_ion.DFN({
@@ -30,95 +31,62 @@ cycle = [
         "Rest for 300 seconds"
     )
 ]
-experiment = pybamm.Experiment(cycle * 1, temperature=298.15)  # Run one cycle at a time
+MAX_CYCLES = 5  # Run for up to 5 cycles
+experiment = pybamm.Experiment(cycle * MAX_CYCLES, temperature=298.15)  # All cycles in one run
 
-# 4. Solver configuration
+# 4. Thermal runaway thresholds, checked by the solver at every step
+dTdt_threshold = 1.0
+max_temp = 393.15
+add_runaway_events(model, max_temp, dTdt_threshold)
+
+# 5. Solver configuration
 solver = pybamm.IDAKLUSolver(rtol=1e-6, atol=1e-8)
 
-# 5. Initial simulation
+# 6. Single simulation; aging is carried from cycle to cycle and the solve
+# stops as soon as a runaway threshold is crossed
 sim = pybamm.Simulation(model, parameter_values=param, experiment=experiment, solver=solver)
 
-# Store initial solution
+# A step that starts with a threshold already crossed cannot end on the
+# event; the callback records it as runaway instead
+runaway_callback = RunawayCallback()
 try:
-    solution = sim.solve(npts=500)
+    solution = sim.solve(callbacks=[runaway_callback])
 except pybamm.SolverError as e:
-    print(f"Solver failed: {e}")
-    exit()  # Stop if the initial simulation fails
+    if runaway_callback.error is not None:
+        print(f"⚠️ Thermal runaway detected at the start of the run ({e})")
+    else:
+        print(f"Solver failed: {e}")
+    exit()  # Nothing was solved
+
+thermal_runaway_detected = runaway_detected(solution, runaway_callback)
+n_cycles = len(solution.cycles)
+for i, cycle_solution in enumerate(solution.cycles, start=1):
+    temperature = cycle_solution["X-averaged cell temperature [K]"].entries
+    dT_dt = cycle_solution["Cell temperature rise rate [K.s-1]"].entries
+    print(f"Cycle {i}: Max temp {np.max(temperature)-273.15:.1f}°C, Max dT/dt {np.max(dT_dt):.2f} K/s")
+
+if runaway_callback.error is not None:
+    print(f"⚠️ Thermal runaway detected at the start of a step in cycle {runaway_callback.cycle}")
+elif thermal_runaway_detected:
+    print(f"⚠️ Thermal runaway detected in cycle {n_cycles} ({solution.termination})")
+else:
+    print(f"🛑 Stopped after {n_cycles} of {MAX_CYCLES} cycles without thermal runaway ({solution.termination})")
 
 # Store results
 all_data = {
-    "time": list(solution["Time [s]"].entries),
-    "voltage": list(solution["Terminal voltage [V]"].entries),
-    "current": list(solution["Current [A]"].entries),
-    "temperature": list(solution["X-averaged cell temperature [K]"].entries),
-    "dTdt": list(np.gradient(
-        solution["X-averaged cell temperature [K]"].entries,
-        solution["Time [s]"].entries)),
+    "time": solution["Time [s]"].entries,
+    "voltage": solution["Terminal voltage [V]"].entries,
+    "current": solution["Current [A]"].entries,
+    "temperature": solution["X-averaged cell temperature [K]"].entries,
+    "dTdt": solution["Cell temperature rise rate [K.s-1]"].entries,
 }
 
-# 6. Continued cycling with enhanced termination checks
-n_cycles = 1  # Start from cycle 1
-thermal_runaway_detected = False
-dTdt_threshold = 1.0
-max_temp = 393.15
-MAX_CYCLES = 5  # Run for up to 50 cycles
-
-while not thermal_runaway_detected and n_cycles <= MAX_CYCLES:
-    print(f"🔥 Running cycle {n_cycles}...")
-
-    # Run one cycle at a time
-    experiment = pybamm.Experiment(cycle * 1, temperature=298.15)
-
-    try:
-        sim_cont = pybamm.Simulation(
-            model,
-            parameter_values=param,
-            experiment=experiment,
-            solver=solver
-        )
-
-        solution = sim_cont.solve(npts=500)
-
-    except Exception as e:
-        print(f"⚠️ Solver failed at cycle {n_cycles}: {str(e)}")
-        break
-
-    # Process results
-    time = solution["Time [s]"].entries
-    voltage = solution["Terminal voltage [V]"].entries
-    current = solution["Current [A]"].entries
-    temperature = solution["X-averaged cell temperature [K]"].entries
-    dT_dt = np.gradient(temperature, time)
-
-    # Debug monitoring
-    print(f"Cycle {n_cycles}: Max temp {np.max(temperature)-273.15:.1f}°C, Max dT/dt {np.max(dT_dt):.2f} K/s")
-
-    # Append results with offset
-    time_offset = all_data["time"][-1]
-    all_data["time"].extend(time + time_offset)
-    all_data["voltage"].extend(voltage)
-    all_data["current"].extend(current)
-    all_data["temperature"].extend(temperature)
-    all_data["dTdt"].extend(dT_dt)
-
-    # Check thermal runaway at the END of each cycle
-    if np.max(dT_dt) > dTdt_threshold or np.max(temperature) > max_temp:
-        print(f"⚠️ Thermal runaway detected in cycle {n_cycles}")
-        thermal_runaway_detected = True
-        break  # Stop the simulation
-
-    n_cycles += 1  # Increment cycle number
-
-# Force stop if max cycles reached
-if n_cycles > MAX_CYCLES:
-    print(f"🛑 Stopped after {MAX_CYCLES} cycles without thermal runaway")
-
 # 7. Plotting results
-time = np.array(all_data["time"])
-voltage = np.array(all_data["voltage"])
-current = np.array(all_data["current"])
-temperature = np.array(all_data["temperature"])
-dTdt = np.array(all_data["dTdt"])
+time = all_data["time"]
+voltage = all_data["voltage"]
+current = all_data["current"]
+temperature = all_data["temperature"]
+dTdt = all_data["dTdt"]
 
 # Voltage/Current/Temperature plot
 fig, ax1 = plt.subplots(figsize=(12, 6))
@@ -151,7 +119,7 @@ plt.tight_layout()
 
 plt.show()
 
-print(f"\n🔋 Total cycles completed: {n_cycles-1}")
+print(f"\n🔋 Total cycles completed: {n_cycles}")
 print(f"⏱️ Failure time: {time[-1]/3600:.1f} hours")
 print(f"🌡️ Max temperature reached: {np.max(temperature)-273.15:.1f}°C")
 print(f"🚨 Max dT/dt: {np.max(dTdt):.1f} K/s")
@@ -1,14 +1,12 @@
-import pybamm
 import numpy as np
 import matplotlib.pyplot as plt
+from Parameter_Lookup import electrode_area as area, lookup
 
-# Load parameters from Chen2020 model
-params = pybamm.ParameterValues("Chen2020")
-
-# Parameters
-rho_sei = params["SEI resistivity [Ohm.m]"]
-delta_sei_0 = params["Initial SEI thickness [m]"]  # SEI thickness at cycle 0
-electrode_area = params["Electrode width [m]"] * params["Electrode height [m]"]  # m²
+# Parameters (Chen2020)
+rho_sei, delta_sei_0 = lookup(
+    "Chen2020", "SEI resistivity [Ohm.m]", "Initial SEI thickness [m]"
+)  # delta_sei_0: SEI thickness at cycle 0
+electrode_area = area("Chen2020")  # m²
 
 # Simulation parameters
 cycles = 1200
@@ -0,0 +1,122 @@
+import json
+import os
+
+import numpy as np
+
+# Append-only columnar store for per-cycle summaries. Every column is one raw
+# float64 file shared by all runs (memory-mapped on read), and index.json
+# records each run's parameters and row range. Text columns (e.g.
+# "Experiment") are stored as codes into a per-column list of categories.
+INDEX_FILE = "index.json"
+
+
+class ResultStore:
+    def __init__(self, root):
+        self.root = root
+        path = os.path.join(root, INDEX_FILE)
+        if os.path.exists(path):
+            with open(path) as f:
+                self.index = json.load(f)
+        else:
+            self.index = {"rows": 0, "columns": {}, "categories": {}, "runs": []}
+
+    def _column_path(self, name):
+        return os.path.join(self.root, self.index["columns"][name])
+
+    def _write_index(self):
+        path = os.path.join(self.root, INDEX_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def _encode(self, name, value):
+        if isinstance(value, str):
+            categories = self.index["categories"].setdefault(name, [])
+            if value not in categories:
+                categories.append(value)
+            return categories.index(value)
+        return value
+
+    def append(self, parameters, summaries):
+        """Add one run: its parameters and a list of per-cycle summary dicts.
+
+        Returns the run number.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        rows = self.index["rows"]
+        names = list(dict.fromkeys(name for summary in summaries for name in summary))
+        for name in names:
+            if name not in self.index["columns"]:
+                self.index["columns"][name] = f"column_{len(self.index['columns'])}.f64"
+                # Earlier runs did not have this column
+                np.full(rows, np.nan).tofile(self._column_path(name))
+
+        for name in self.index["columns"]:
+            values = np.array(
+                [self._encode(name, summary.get(name, np.nan)) for summary in summaries], dtype=np.float64
+            )
+            with open(self._column_path(name), "r+b") as f:
+                # Drop anything written after the last indexed row (e.g. by a killed append)
+                f.truncate(rows * 8)
+                f.seek(rows * 8)
+                values.tofile(f)
+
+        run = len(self.index["runs"])
+        parameters = {
+            name: value.item() if isinstance(value, np.generic) else value for name, value in parameters.items()
+        }
+        self.index["runs"].append(
+            {"run": run, "parameters": parameters, "start": rows, "rows": len(summaries)}
+        )
+        self.index["rows"] = rows + len(summaries)
+        self._write_index()
+        return run
+
+    def runs(self, where=None):
+        """Index entries of the runs whose parameters match `where`.
+
+        `where` maps a parameter name to a value or to a predicate.
+        """
+
+        def matches(parameters, name, condition):
+            if name not in parameters:
+                return False
+            if callable(condition):
+                return condition(parameters[name])
+            return parameters[name] == condition
+
+        return [
+            run
+            for run in self.index["runs"]
+            if all(matches(run["parameters"], name, condition) for name, condition in (where or {}).items())
+        ]
+
+    def query(self, where=None, cycles=None, columns=None):
+        """Return {column: array} for the matching runs, plus a "Run" column.
+
+        `cycles` selects rows within each run (a slice or positions, 0-based);
+        `columns` selects columns (all by default). Columns are read through
+        memory maps, so only the selected rows are loaded.
+        """
+        columns = list(self.index["columns"]) if columns is None else list(columns)
+        selected = []
+        for run in self.runs(where):
+            rows = np.arange(run["start"], run["start"] + run["rows"])
+            if cycles is not None:
+                rows = rows[cycles]
+            selected.append((run["run"], rows))
+        rows = np.concatenate([r for _, r in selected] + [np.empty(0, dtype=int)])
+
+        result = {"Run": np.concatenate([np.full(len(r), run) for run, r in selected] + [np.empty(0, dtype=int)])}
+        for name in columns:
+            if len(rows):
+                data = np.memmap(self._column_path(name), dtype=np.float64, mode="r", shape=(self.index["rows"],))
+                values = np.asarray(data[rows])
+            else:
+                values = np.empty(0)
+            if name in self.index["categories"]:
+                # Decode text columns; rows without a value become None
+                categories = np.array(self.index["categories"][name] + [None], dtype=object)
+                values = categories[np.where(np.isnan(values), -1, values).astype(int)]
+            result[name] = values
+        return result
@@ -0,0 +1,264 @@
+import numpy as np
+from scipy import sparse
+from scipy.integrate import solve_ivp
+
+# Solvent diffusion through a growing SEI layer (the model in BBBBB.py), on the
+# fixed domain xi = x / L in [0, 1]:
+#
+#   dc/dt = (V R / L) xi dc/dxi + 1 / L^2 d/dxi (D(c) dc/dxi)
+#   dL/dt = V R,  R = k c(0)
+#   D(c) dc/dxi = R L at xi = 0,  c = c_inf at xi = 1
+#
+# `build_model` returns it as a pybamm model. `solve_sei_layer` integrates the
+# same finite-volume discretisation directly with an implicit BDF method and
+# an analytic sparse Jacobian (tridiagonal in c, plus the columns for the
+# surface concentration and L); `solve_sei_layers` does the same for a whole
+# population of cells as one block-diagonal system. Both step in log(time)
+# and log(L): growth tends to L ~ sqrt(t) with a steady profile in xi, which
+# is a fixed point in those variables, so the adaptive steps span whole
+# decades of calendar time and years cost about as much as the first few
+# seconds.
+
+
+def linear_diffusivity(c):
+    return c * 10 ** (-12)
+
+
+def linear_diffusivity_derivative(c):
+    return np.full_like(c, 10 ** (-12))
+
+
+# parameter values (not physically based, for example only!)
+DEFAULT_PARAMETERS = {
+    "Reaction rate constant [m.s-1]": 1e-6,
+    "Initial thickness [m]": 1e-6,
+    "Partial molar volume [m3.mol-1]": 10,
+    "Bulk electrolyte solvent concentration [mol.m-3]": 1,
+    "Diffusivity [m2.s-1]": linear_diffusivity,
+    # dD/dc, for the analytic Jacobian
+    "Diffusivity derivative [m5.s-1.mol-1]": linear_diffusivity_derivative,
+}
+
+
+def build_model():
+    """The SEI layer as a pybamm model; returns (model, geometry, xi)."""
+    import pybamm
+
+    model = pybamm.BaseModel()
+    # dimensional parameters
+    k = pybamm.Parameter("Reaction rate constant [m.s-1]")
+    L_0 = pybamm.Parameter("Initial thickness [m]")
+    V_hat = pybamm.Parameter("Partial molar volume [m3.mol-1]")
+    c_inf = pybamm.Parameter("Bulk electrolyte solvent concentration [mol.m-3]")
+
+    def D(cc):
+        return pybamm.FunctionParameter("Diffusivity [m2.s-1]", {"Solvent concentration [mol.m-3]": cc})
+
+    xi = pybamm.SpatialVariable("xi", domain="SEI layer", coord_sys="cartesian")
+    c = pybamm.Variable("Solvent concentration [mol.m-3]", domain="SEI layer")
+    L = pybamm.Variable("SEI thickness [m]")
+
+    # SEI reaction flux
+    R = k * pybamm.BoundaryValue(c, "left")
+
+    # solvent concentration equation
+    N = -1 / L * D(c) * pybamm.grad(c)
+    dcdt = (V_hat * R) / L * pybamm.inner(xi, pybamm.grad(c)) - 1 / L * pybamm.div(N)
+
+    # SEI thickness equation
+    dLdt = V_hat * R
+
+    model.rhs = {c: dcdt, L: dLdt}
+
+    # pybamm requires BoundaryValue(D(c)) and not D(BoundaryValue(c))
+    D_left = pybamm.BoundaryValue(D(c), "left")
+    grad_c_left = R * L / D_left
+    model.boundary_conditions = {c: {"left": (grad_c_left, "Neumann"), "right": (c_inf, "Dirichlet")}}
+    model.initial_conditions = {c: c_inf, L: L_0}
+
+    model.variables = {
+        "SEI thickness [m]": L,
+        "SEI growth rate [m]": dLdt,
+        "Solvent concentration [mol.m-3]": c,
+    }
+
+    geometry = pybamm.Geometry({"SEI layer": {xi: {"min": pybamm.Scalar(0), "max": pybamm.Scalar(1)}}})
+    return model, geometry, xi
+
+
+class _Discretisation:
+    """Right-hand side and Jacobian of the finite-volume system for a batch of
+    independent cells, stacked into one block-diagonal system.
+
+    Each cell's state is [c_0, ..., c_{n-1}, log(L / L_0)] and the time
+    variable is tau = log(t + t_0), with t_0 a small fraction of the shortest
+    diffusion or growth timescale in the batch. Face fluxes F = D dc/dxi
+    use the mean D of the neighbouring cells, the surface concentration is
+    extrapolated linearly from the first two cells, and the right face uses a
+    ghost cell for the Dirichlet condition. The surface flux is R L, and the
+    first cell's advection uses its one-sided gradient, so nothing divides by
+    D(c(0)) (which the pybamm model does, and which breaks down as c(0) -> 0
+    on long horizons).
+
+    Per-cell quantities are (cells, 1) columns so they broadcast against the
+    (cells, points) concentrations.
+    """
+
+    def __init__(self, parameters, points):
+        def column(name):
+            return np.asarray(parameters[name], dtype=float).reshape(-1, 1)
+
+        self.k = column("Reaction rate constant [m.s-1]")
+        self.L_0 = column("Initial thickness [m]")
+        self.V = column("Partial molar volume [m3.mol-1]")
+        self.c_inf = column("Bulk electrolyte solvent concentration [mol.m-3]")
+        self.D = parameters["Diffusivity [m2.s-1]"]
+        self.dD = parameters["Diffusivity derivative [m5.s-1.mol-1]"]
+        self.D_inf = np.asarray(self.D(self.c_inf), dtype=float).reshape(-1, 1)
+        self.cells = np.broadcast_shapes(*(a.shape for a in (self.k, self.L_0, self.V, self.c_inf, self.D_inf)))[0]
+        for name in ["k", "L_0", "V", "c_inf", "D_inf"]:
+            setattr(self, name, np.broadcast_to(getattr(self, name), (self.cells, 1)))
+        self.n = points
+        self.h = 1 / points
+        self.xi = (np.arange(points) + 0.5) * self.h
+        self.t_0 = 1e-3 * np.min(np.minimum(self.L_0**2 / self.D_inf, self.L_0 / (self.V * self.k * self.c_inf)))
+        # Fixed sparsity pattern of each cell's block: the tridiagonal block
+        # in c, dense columns for c_0, c_1 (through R) and L, and the L row
+        i = np.arange(points)
+        rows = np.concatenate([i[1:], i, i[:-1], i, i, i, [points, points, points]])
+        cols = np.concatenate(
+            [i[:-1], i, i[1:], np.zeros(points), np.ones(points), np.full(points, points), [0, 1, points]]
+        )
+        offsets = (points + 1) * np.arange(self.cells)[:, None]
+        self.pattern = ((rows + offsets).ravel(), (cols + offsets).ravel())
+
+    def initial_state(self):
+        y0 = np.zeros((self.cells, self.n + 1))
+        y0[:, :-1] = self.c_inf
+        return y0.ravel()
+
+    def _faces(self, y):
+        y = y.reshape(self.cells, self.n + 1)
+        c, L = y[:, :-1], self.L_0 * np.exp(y[:, -1:])
+        h = self.h
+        c_b = 1.5 * c[:, :1] - 0.5 * c[:, 1:2]
+        R = self.k * c_b
+        D_c = self.D(c)
+        g = np.zeros((self.cells, self.n + 1))
+        g[:, 1:-1] = np.diff(c) / h
+        g[:, -1:] = 2 * (self.c_inf - c[:, -1:]) / h
+        F = np.empty((self.cells, self.n + 1))
+        F[:, :1] = R * L
+        F[:, 1:-1] = 0.5 * (D_c[:, :-1] + D_c[:, 1:]) * g[:, 1:-1]
+        F[:, -1:] = self.D_inf * g[:, -1:]
+        return c, L, R, D_c, g, F
+
+    def _face_sum(self, g):
+        # Sum of each cell's face gradients; the first cell uses its one-sided gradient
+        G = g[:, :-1] + g[:, 1:]
+        G[:, 0] = 2 * g[:, 1]
+        return G
+
+    def rhs(self, tau, y):
+        c, L, R, D_c, g, F = self._faces(y)
+        advection = self.V * R / (2 * L) * self.xi * self._face_sum(g)
+        diffusion = np.diff(F) / (self.h * L**2)
+        # dt / dtau = t + t_0 = exp(tau), and dlog(L) / dt = V R / L
+        return np.exp(tau) * np.hstack([advection + diffusion, self.V * R / L]).ravel()
+
+    def jacobian(self, tau, y):
+        # Derivatives in t and L / L_0, then scaled to tau and log(L / L_0)
+        c, L, R, D_c, g, F = self._faces(y)
+        h, k = self.h, self.k
+        dD_c = self.dD(c)
+        D_face = 0.5 * (D_c[:, :-1] + D_c[:, 1:])
+        a = self.V * self.xi / (2 * L)
+        G = self._face_sum(g)
+        scale = 1 / (h * L**2)
+        diffusion = np.diff(F) * scale
+
+        # d F_j / d c_{j-1} and d F_j / d c_j for the interior faces
+        lower = 0.5 * dD_c[:, :-1] * g[:, 1:-1] - D_face / h
+        upper = 0.5 * dD_c[:, 1:] * g[:, 1:-1] + D_face / h
+
+        # Diffusion: cell i gets (F_{i+1} - F_i) * scale, with F_0 = R L
+        diagonal = np.zeros((self.cells, self.n))
+        diagonal[:, :-1] += lower
+        diagonal[:, 1:] -= upper
+        diagonal[:, -1:] -= 2 * self.D_inf / h
+        diagonal[:, :1] -= 1.5 * k * L
+        sub = -lower * scale
+        diagonal *= scale
+        sup = upper * scale
+        # Advection: a_i R G_i
+        sub -= a[:, 1:] * R / h
+        sup += a[:, :-1] * R / h
+        sup[:, :1] += a[:, :1] * R / h
+        diagonal[:, :1] -= 2 * a[:, :1] * R / h
+        diagonal[:, -1:] -= a[:, -1:] * R / h
+
+        column_0 = 1.5 * k * a * G
+        column_1 = -0.5 * k * a * G
+        column_1[:, :1] += 0.5 * k * L * scale
+        column_L = -(a * R * G + 2 * diffusion)
+        column_L[:, :1] -= R * L * scale
+        row_L = [1.5 * k * self.V / L, -0.5 * k * self.V / L, -self.V * R / L]
+        values = np.hstack([sub, diagonal, sup, column_0, column_1, column_L, *row_L]).ravel()
+        size = self.cells * (self.n + 1)
+        return sparse.csc_matrix((np.exp(tau) * values, self.pattern), shape=(size, size))
+
+
+def solve_sei_layers(t_end, parameters=None, points=100, t_eval=None, rtol=1e-6, atol=1e-8):
+    """Integrate a population of independent SEI layers in one implicit solve.
+
+    Any scalar in `parameters` may be an array with one entry per cell, and
+    the diffusivity functions get c as a (cells, points) array, so per-cell
+    values go in as columns, e.g.
+    {"Diffusivity [m2.s-1]": lambda c: D_ref[:, None] * c,
+    "Diffusivity derivative [m5.s-1.mol-1]": lambda c: D_ref[:, None] + 0 * c}.
+    All cells share the adaptive time steps and the error norm, which is an
+    RMS over the whole batch, so tighten `rtol` for large populations if
+    every cell must meet it individually. Returns a dict like
+    `solve_sei_layer` with a leading cells axis on every output but "Time [s]"
+    and "xi".
+    """
+    disc = _Discretisation({**DEFAULT_PARAMETERS, **(parameters or {})}, points)
+    tau_span = np.log(np.array([0, t_end]) + disc.t_0)
+    tau_eval = None if t_eval is None else np.log(np.asarray(t_eval) + disc.t_0)
+    solution = solve_ivp(
+        disc.rhs,
+        tau_span,
+        disc.initial_state(),
+        method="BDF",
+        jac=disc.jacobian,
+        t_eval=tau_eval,
+        rtol=rtol,
+        atol=atol,
+    )
+    if not solution.success:
+        raise RuntimeError(f"SEI layer solve failed: {solution.message}")
+    y = solution.y.reshape(disc.cells, points + 1, -1)
+    c, L = y[:, :-1], disc.L_0 * np.exp(y[:, -1])
+    c_b = 1.5 * c[:, 0] - 0.5 * c[:, 1]
+    time = np.exp(solution.t) - disc.t_0
+    if t_eval is not None:
+        time = np.asarray(t_eval, dtype=float)
+    return {
+        "Time [s]": time,
+        "xi": disc.xi,
+        "SEI thickness [m]": L,
+        "SEI growth rate [m]": disc.V * disc.k * c_b,
+        "Solvent concentration [mol.m-3]": c,
+    }
+
+
+def solve_sei_layer(t_end, parameters=None, points=100, t_eval=None, rtol=1e-6, atol=1e-8):
+    """Integrate the SEI layer from 0 to `t_end` [s] with adaptive BDF steps.
+
+    `parameters` defaults to DEFAULT_PARAMETERS; a non-linear diffusivity
+    needs its "Diffusivity derivative [m5.s-1.mol-1]" too. Returns a dict of
+    arrays with the pybamm model's variable names, plus "Time [s]" and "xi"
+    (cell centres); concentrations have shape (points, times).
+    """
+    result = solve_sei_layers(t_end, parameters, points, t_eval, rtol, atol)
+    return {name: values if name in ("Time [s]", "xi") else values[0] for name, values in result.items()}
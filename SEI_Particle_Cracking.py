@@ -1,62 +1,80 @@
 import pybamm
 import matplotlib.pyplot as plt
+from Drive_Cycle import cached_drive_cycle, compile_steps
+from Profiling import RunProfiler
 
 # Set logging level
 pybamm.set_logging_level("NOTICE")
 
-# Set up the second model and parameters (with aging mechanisms)
-model = pybamm.lithium_ion.DFN(options={
-    "SEI": "solvent-diffusion limited",
-    "SEI porosity change": "true",
-    "particle mechanics": "swelling and cracking",
-    "SEI on cracks": "true",
-})
-
+# Set up the parameters for the model (with aging mechanisms)
 param = pybamm.ParameterValues("OKane2022")
 var_pts = {"x_n": 10, "x_s": 10, "x_p": 10, "r_n": 16, "r_p": 16}
-param["Ambient temperature [K]"] = 298.15  # Fixed at 25°C
 
-# Define the experimental protocol
-experiment = pybamm.Experiment(
-    [
-        (
-            "Discharge at 0.8A for 0.4 seconds",
-            "Charge at 1A for 0.3 seconds",
-            "Charge at 0.8A for 0.3 seconds",
-            "Discharge at 1A for 0.2 seconds",
-            "Charge at 1A for 0.4 seconds",
-            "Discharge at 1A for 2.0 seconds",
-            "Discharge at 1A for 0.4 seconds",
-            "Charge at 0.7A for 6.3 seconds",
-            "Discharge at 0.7A for 3.4 seconds",
-            "Discharge at 0.7A for 5.7 seconds",
-            "Charge at 1A for 0.4 seconds",
-            "Discharge at 1A for 0.5 seconds",
-            "Charge at 1A for 6.7 seconds",
-            "Discharge at 1A for 0.2 seconds",
-            "Discharge at 0.6A for 8.7 seconds",
-            "Discharge at 0.6A for 0.4 seconds",
-            "Charge at 0.6A for 7.0 seconds",
-            "Charge at 0.6A for 0.3 seconds",
-            "Discharge at 1A for 0.2 seconds",
-            "Discharge at 1A for 0.1 seconds",
-            "Rest for 1.1 seconds",
-            "Discharge at 5A for 30 seconds",
-            "Discharge at 10A for 15 seconds",
-            "Rest for 10 seconds"
-        )*100
-    ],
-    period="0.1 seconds",
-    termination="1V"
-)
+# Define the experimental protocol (24 pulse steps, repeated 100 times)
+experiment_steps = [
+    (
+        "Discharge at 0.8A for 0.4 seconds",
+        "Charge at 1A for 0.3 seconds",
+        "Charge at 0.8A for 0.3 seconds",
+        "Discharge at 1A for 0.2 seconds",
+        "Charge at 1A for 0.4 seconds",
+        "Discharge at 1A for 2.0 seconds",
+        "Discharge at 1A for 0.4 seconds",
+        "Charge at 0.7A for 6.3 seconds",
+        "Discharge at 0.7A for 3.4 seconds",
+        "Discharge at 0.7A for 5.7 seconds",
+        "Charge at 1A for 0.4 seconds",
+        "Discharge at 1A for 0.5 seconds",
+        "Charge at 1A for 6.7 seconds",
+        "Discharge at 1A for 0.2 seconds",
+        "Discharge at 0.6A for 8.7 seconds",
+        "Discharge at 0.6A for 0.4 seconds",
+        "Charge at 0.6A for 7.0 seconds",
+        "Charge at 0.6A for 0.3 seconds",
+        "Discharge at 1A for 0.2 seconds",
+        "Discharge at 1A for 0.1 seconds",
+        "Rest for 1.1 seconds",
+        "Discharge at 5A for 30 seconds",
+        "Discharge at 10A for 15 seconds",
+        "Rest for 10 seconds"
+    )*100
+]
+
+# Compile the pulses into one current-vs-time input, so the whole protocol is
+# solved as a single segment instead of 2400 separate experiment steps
+times, currents = compile_steps(experiment_steps[0])
+
+# Ambient temperature is an input parameter, so other temperatures can be
+# solved on the same built model by passing a list of inputs
+inputs = {"Ambient temperature [K]": 298.15}  # Fixed at 25°C
 
-# Create simulation object for the Model with the IDAKLUSolver
+# Solve the Model with the IDAKLUSolver
 solver = pybamm.IDAKLUSolver(rtol=1e-6, atol=1e-8)  # Use a specific solver with set tolerances
-simulation = pybamm.Simulation(model, experiment=experiment, parameter_values=param, var_pts=var_pts, solver=solver)
+# The outputs are memoised in the solution cache, so re-running the script
+# loads them instead of re-solving. Time and peak memory per stage are
+# appended to profiles.jsonl
 print("Starting simulation for Model ...")
-solution = simulation.solve()
-time = solution["Time [s]"].entries
-voltage = solution["Terminal voltage [V]"].entries
+with RunProfiler("SEI particle cracking", path="profiles.jsonl"):
+    model = pybamm.lithium_ion.DFN(options={
+        "SEI": "solvent-diffusion limited",
+        "SEI porosity change": "true",
+        "particle mechanics": "swelling and cracking",
+        "SEI on cracks": "true",
+    })
+    variables = cached_drive_cycle(
+        model,
+        param,
+        times,
+        currents,
+        ["Time [s]", "Terminal voltage [V]"],
+        period=0.1,
+        termination=1.0,
+        solver=solver,
+        inputs=inputs,
+        var_pts=var_pts,
+    )
+    time = variables["Time [s]"]
+    voltage = variables["Terminal voltage [V]"]
 
 # Plot results
 plt.figure(figsize=(10, 6))
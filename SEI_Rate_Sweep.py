@@ -0,0 +1,54 @@
+import matplotlib.pyplot as plt
+from Parameter_Sweep import input_sweep, parameter_grid
+from Result_Store import ResultStore
+
+# Same model and protocol as AGING_EFFECT(AH_LLI_LAM).py
+N = 10  # Number of repetitions in CCCV experiment
+M = 5  # Number of aging sets
+spec = {
+    "model": "DFN",
+    "options": {"SEI": "ec reaction limited"},
+    "parameter_set": "Chen2020",
+    "experiments": {
+        "cccv": [
+            (
+                "Discharge at 1C until 2.5V",
+                "Charge at 0.3C until 4.2V (3 minute period)",
+                "Hold at 4.2V until C/100 (3 minute period)",
+            )
+        ]
+        * N,
+        "charge": [("Charge at 1C until 4.2V", "Hold at 4.2V until C/100")],
+    },
+    "sequence": ["cccv", "charge"],
+    "sets": M,
+    "discharge_steps": {"cccv": 0},  # step 0 of each cycle is the discharge
+}
+
+# Grid of parameter overrides to sweep. The rate constant is a pybamm input
+# parameter, so each worker builds once per temperature and re-solves the
+# built models for every rate
+grid = parameter_grid(
+    {
+        "SEI kinetic rate constant [m.s-1]": [1e-15, 1e-14, 1e-13],
+        "Ambient temperature [K]": [298.15, 318.15],
+    }
+)
+
+if __name__ == "__main__":
+    results = input_sweep(spec, grid, inputs=["SEI kinetic rate constant [m.s-1]"])
+
+    # Archive the per-cycle summaries so they can be queried without re-simulating
+    store = ResultStore("aging_results")
+    for overrides, summaries in results:
+        store.append(dict(overrides, script="SEI_Rate_Sweep"), summaries)
+
+    # Plot the capacity fade over cycles for every grid point
+    for overrides, summaries in results:
+        capacities = [s["Discharge capacity [A.h]"] for s in summaries if s["Experiment"] == "cccv"]
+        label = ", ".join(f"{name.split(' [')[0]} = {value:g}" for name, value in overrides.items())
+        plt.plot(range(1, len(capacities) + 1), capacities, label=label)
+    plt.xlabel("Cycle number")
+    plt.ylabel("Discharge capacity [A.h]")
+    plt.legend()
+    plt.show()
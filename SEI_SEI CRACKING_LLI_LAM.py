@@ -1,5 +1,6 @@
 import pybamm
 import matplotlib.pyplot as plt
+from Solution_Cache import cached_variables
 
 # Define the model including LLI and LAM (loss of active material)
 model = pybamm.lithium_ion.DFN(
@@ -28,7 +29,7 @@ var_pts = {
 cycle_number = 10
 
 # Define the experiment
-exp = pybamm.Experiment(
+exp_steps = (
     [
         "Hold at 4.2 V until C/100 (5 minute period)",
         "Rest for 4 hours (5 minute period)",
@@ -50,21 +51,30 @@ exp = pybamm.Experiment(
 # Solver
 solver = pybamm.IDAKLUSolver()
 
-# Simulation
-sim = pybamm.Simulation(
-    model, parameter_values=param, experiment=exp, solver=solver, var_pts=var_pts
+# Solve, or load the stored variables if this exact run was cached
+sol = cached_variables(
+    model,
+    param,
+    exp_steps,
+    [
+        "Throughput capacity [A.h]",
+        "Loss of capacity to negative SEI [A.h]",
+        "Loss of capacity to negative SEI on cracks [A.h]",
+        "Total lithium lost [mol]",
+        "Loss of active material in negative electrode [%]",
+        "Loss of active material in positive electrode [%]",
+    ],
+    solver=solver,
+    var_pts=var_pts,
 )
 
-# Solve
-sol = sim.solve()
-
 # Extract data
-Qt = sol["Throughput capacity [A.h]"].entries
-Q_SEI = sol["Loss of capacity to negative SEI [A.h]"].entries
-Q_SEI_cr = sol["Loss of capacity to negative SEI on cracks [A.h]"].entries
-Q_LLI = sol["Total lithium lost [mol]"].entries * 96485.3 / 3600  # Convert to A.h
-Q_LAM_n = sol["Loss of active material in negative electrode [%]"].entries
-Q_LAM_p = sol["Loss of active material in positive electrode [%]"].entries
+Qt = sol["Throughput capacity [A.h]"]
+Q_SEI = sol["Loss of capacity to negative SEI [A.h]"]
+Q_SEI_cr = sol["Loss of capacity to negative SEI on cracks [A.h]"]
+Q_LLI = sol["Total lithium lost [mol]"] * 96485.3 / 3600  # Convert to A.h
+Q_LAM_n = sol["Loss of active material in negative electrode [%]"]
+Q_LAM_p = sol["Loss of active material in positive electrode [%]"]
 
 # ------------------------------
 
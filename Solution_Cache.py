@@ -0,0 +1,216 @@
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import pybamm
+
+# Solved experiments are memoised here, one file per cache key
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".solution_cache")
+
+# Least recently used entries are evicted once the cache grows past this
+MAX_CACHE_SIZE = 2 * 1024**3  # bytes
+
+
+def _fingerprint(value):
+    # Stable text form of options, parameters and protocols. Functions are
+    # identified by name and bytecode, arrays by content, so the key does not
+    # depend on object ids.
+    if isinstance(value, dict):
+        items = sorted(value.items(), key=lambda item: str(item[0]))
+        return "{" + ",".join(f"{_fingerprint(k)}:{_fingerprint(v)}" for k, v in items) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_fingerprint(v) for v in value) + "]"
+    if isinstance(value, np.ndarray):
+        return hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+    if isinstance(value, pybamm.BaseSolver):
+        return f"{type(value).__name__}(rtol={value.rtol},atol={value.atol})"
+    if isinstance(value, pybamm.Symbol):
+        return str(value)
+    if callable(value):
+        name = f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', type(value).__name__)}"
+        code = getattr(value, "__code__", None)
+        if code is not None:
+            name += hashlib.sha256(code.co_code + repr(code.co_consts).encode()).hexdigest()
+        return name
+    return repr(value)
+
+
+def cache_key(model, parameter_values, steps, experiment_kwargs=None, solve_kwargs=None, **kwargs):
+    """Hash of the model, its options, the parameter values and the protocol.
+
+    The model enters through its class, options, events, state variables and
+    variable names, so a model edited after construction (extra events or
+    variables) gets its own key; edits that only change an equation of an
+    existing variable are not seen.
+
+    Experiment keyword arguments (period, termination), solve keyword
+    arguments and Simulation keyword arguments (var_pts, solver with its
+    tolerances, ...) are all part of the key.
+    """
+    content = {
+        "model": type(model).__name__,
+        "options": dict(getattr(model, "options", {}) or {}),
+        "events": [(event.name, str(event.expression)) for event in model.events],
+        "states": sorted(variable.name for variable in list(model.rhs) + list(model.algebraic)),
+        "variables": sorted(model.variables.keys()),
+        "parameters": dict(parameter_values.items()),
+        "steps": [str(step) for step in steps],
+        "experiment_kwargs": experiment_kwargs or {},
+        "solve_kwargs": solve_kwargs or {},
+        "kwargs": kwargs,
+    }
+    return hashlib.sha256(_fingerprint(content).encode()).hexdigest()
+
+
+def _output_solver(model, solver, outputs):
+    # IDAKLU can evaluate just the requested variables while integrating and
+    # drop the state history; other solvers keep the full solution
+    solver = solver if solver is not None else model.default_solver
+    if not isinstance(solver, pybamm.IDAKLUSolver):
+        return solver
+    solver = solver.copy()
+    solver.output_variables = list(outputs)
+    return solver
+
+
+def _solve(
+    model, parameter_values, steps, experiment_kwargs=None, solve_kwargs=None, outputs=None, **kwargs
+):
+    experiment = pybamm.Experiment(steps, **(experiment_kwargs or {}))
+    if outputs is not None:
+        kwargs["solver"] = _output_solver(model, kwargs.get("solver"), outputs)
+    sim = pybamm.Simulation(model, experiment=experiment, parameter_values=parameter_values, **kwargs)
+    return sim.solve(**(solve_kwargs or {}))
+
+
+def _load(path, read):
+    # Read an entry and mark it as recently used. Returns None on a miss,
+    # including an entry another process evicts while this one opens it
+    try:
+        os.utime(path)
+        with open(path, "rb") as f:
+            return read(f)
+    except FileNotFoundError:
+        return None
+
+
+def _read_arrays(f):
+    with np.load(f) as data:
+        return {name: data[name] for name in data.files}
+
+
+def _store(path, write, cache_dir, max_size):
+    os.makedirs(cache_dir, exist_ok=True)
+    # Per-process temporary file, so parallel runs writing the same key do not
+    # clobber each other's partial writes
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+    evict(cache_dir, max_size)
+
+
+def evict(cache_dir=CACHE_DIR, max_size=MAX_CACHE_SIZE):
+    """Delete least recently used entries until the cache fits in `max_size`."""
+    if not os.path.isdir(cache_dir):
+        return
+    # Other processes may delete entries while this one scans the cache
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".tmp") or not entry.is_file():
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries[:-1]:  # never evict the entry just written
+        if total <= max_size:
+            break
+        total -= size
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def cached_solve(model, parameter_values, steps, cache_dir=CACHE_DIR, max_size=MAX_CACHE_SIZE, **kwargs):
+    """Solve `steps` as an experiment, or load the memoised solution."""
+    path = os.path.join(cache_dir, cache_key(model, parameter_values, steps, **kwargs) + ".pkl")
+    solution = _load(path, pickle.load)
+    if solution is not None:
+        return solution
+
+    solution = _solve(model, parameter_values, steps, **kwargs)
+    _store(path, lambda f: pickle.dump(solution, f), cache_dir, max_size)
+    return solution
+
+
+def cached_variables(
+    model, parameter_values, steps, variables, cache_dir=CACHE_DIR, max_size=MAX_CACHE_SIZE, **kwargs
+):
+    """Return {name: entries} for `variables`, solving only on a cache miss.
+
+    `variables` is the run's output spec: with an IDAKLU solver only these
+    are evaluated during the solve and the state history is not kept, and
+    only these are stored (as a compressed .npz), so changing a plot label
+    or reusing the same variables skips the solve. If a variable is
+    requested that the entry does not hold yet, the experiment is solved
+    again and the entry is extended.
+    """
+    path = os.path.join(cache_dir, cache_key(model, parameter_values, steps, **kwargs) + ".npz")
+    stored = _load(path, _read_arrays) or {}
+    if stored and all(name in stored for name in variables):
+        return {name: stored[name] for name in variables}
+
+    solution = _solve(model, parameter_values, steps, outputs=variables, **kwargs)
+    stored.update({name: solution[name].entries for name in variables})
+    _store(path, lambda f: np.savez_compressed(f, **stored), cache_dir, max_size)
+    return {name: stored[name] for name in variables}
+
+
+def cached_arrays(key, compute, cache_dir=CACHE_DIR, max_size=MAX_CACHE_SIZE):
+    """Return the {name: array} dict stored under `key`, calling `compute()`
+    to build it on a miss.
+
+    For memoising results that are not plain experiment variables (derived
+    outputs, drive-cycle solves, ...). `key` should come from `cache_key`
+    with an extra keyword naming what is stored, so it cannot collide with
+    a `cached_variables` entry for the same run.
+    """
+    path = os.path.join(cache_dir, key + ".npz")
+    arrays = _load(path, _read_arrays)
+    if arrays is not None:
+        return arrays
+
+    arrays = compute()
+    _store(path, lambda f: np.savez_compressed(f, **arrays), cache_dir, max_size)
+    return arrays
+
+
+class LazySolution:
+    """Stands in for a Solution; the solve only runs when it is first used.
+
+    Indexing (``solution["Voltage [V]"]``) or any Solution attribute triggers
+    `cached_solve`, so repeated runs load the result from disk.
+    """
+
+    def __init__(self, model, parameter_values, steps, cache_dir=CACHE_DIR, **kwargs):
+        self._args = (model, parameter_values, list(steps))
+        self._kwargs = dict(kwargs, cache_dir=cache_dir)
+        self._solution = None
+
+    @property
+    def solution(self):
+        if self._solution is None:
+            self._solution = cached_solve(*self._args, **self._kwargs)
+        return self._solution
+
+    def __getitem__(self, name):
+        return self.solution[name]
+
+    def __getattr__(self, name):
+        return getattr(self.solution, name)
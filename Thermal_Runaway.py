@@ -0,0 +1,66 @@
+import pybamm
+
+# Event names, so a caller can tell from `solution.termination` whether the
+# run stopped because of runaway
+MAX_TEMPERATURE_EVENT = "Maximum cell temperature [K]"
+MAX_TEMPERATURE_RATE_EVENT = "Maximum cell temperature rise rate [K.s-1]"
+
+
+def add_runaway_events(model, max_temperature, max_temperature_rate):
+    """Make the solver stop as soon as runaway thresholds are crossed.
+
+    Adds termination events on the volume-averaged cell temperature and its
+    time derivative (taken from the thermal model's rhs), and exposes the
+    latter as the "Cell temperature rise rate [K.s-1]" variable. Needs a
+    thermal option that solves for the volume-averaged temperature, e.g.
+    {"thermal": "lumped"}. Call before building a Simulation.
+    """
+    T = model.variables["Volume-averaged cell temperature [K]"]
+    dTdt = model.rhs[T]
+    model.variables["Cell temperature rise rate [K.s-1]"] = dTdt
+    model.events.append(
+        pybamm.Event(MAX_TEMPERATURE_EVENT, max_temperature - T, pybamm.EventType.TERMINATION)
+    )
+    model.events.append(
+        pybamm.Event(MAX_TEMPERATURE_RATE_EVENT, max_temperature_rate - dTdt, pybamm.EventType.TERMINATION)
+    )
+    return model
+
+
+def is_runaway_error(error):
+    """True if `error` is the solver refusing to start a step because a
+    runaway threshold is already crossed at the step's initial state."""
+    message = str(error)
+    return "non-positive at initial conditions" in message and (
+        MAX_TEMPERATURE_EVENT in message or MAX_TEMPERATURE_RATE_EVENT in message
+    )
+
+
+class RunawayCallback(pybamm.callbacks.Callback):
+    """Records runaway that the termination events cannot report.
+
+    If a step starts with a threshold already crossed (e.g. dT/dt jumping at a
+    rest -> 10C edge), the solver raises instead of ending on the event.
+    pybamm then stops the experiment at that step, keeping the cycles solved
+    so far, or re-raises if it was the very first step. Pass an instance to
+    `Simulation.solve(callbacks=...)` and check `error` (and the `cycle` it
+    happened in) afterwards.
+    """
+
+    def __init__(self):
+        self.error = None
+        self.cycle = None
+
+    def on_experiment_error(self, logs):
+        if is_runaway_error(logs["error"]):
+            self.error = logs["error"]
+            self.cycle = logs["cycle number"][0]
+
+
+def runaway_detected(solution, callback=None):
+    """True if `solution` ended on one of the runaway events, or `callback`
+    (a RunawayCallback used for the solve) caught one at a step's start."""
+    if callback is not None and callback.error is not None:
+        return True
+    termination = str(solution.termination)
+    return MAX_TEMPERATURE_EVENT in termination or MAX_TEMPERATURE_RATE_EVENT in termination
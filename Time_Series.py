@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+
+
+class TimeSeriesRecorder:
+    """Accumulates multi-cycle time series in preallocated float64 arrays.
+
+    Each column is one contiguous buffer that chunks are copied into, so no
+    per-sample Python objects are created. By default the buffers double when
+    full; with `ring=True` they keep only the latest `capacity` samples. With
+    `path` set, buffers are memory-mapped .npy files in that directory (ring
+    or fixed-size only, since a memory map cannot grow in place).
+    """
+
+    def __init__(self, columns, capacity=4096, ring=False, path=None):
+        self.columns = list(columns)
+        self.ring = ring
+        self.path = path
+        self.total = 0  # samples appended so far, including any overwritten
+        self._buffers = {
+            name: self._allocate(i, capacity) for i, name in enumerate(self.columns)
+        }
+
+    def _allocate(self, index, capacity):
+        if self.path is None:
+            return np.empty(capacity)
+        os.makedirs(self.path, exist_ok=True)
+        return np.lib.format.open_memmap(
+            os.path.join(self.path, f"column_{index}.npy"), mode="w+", dtype=np.float64, shape=(capacity,)
+        )
+
+    @property
+    def capacity(self):
+        return len(self._buffers[self.columns[0]])
+
+    def __len__(self):
+        return min(self.total, self.capacity) if self.ring else self.total
+
+    def _grow(self, needed):
+        if self.path is not None:
+            raise ValueError(
+                f"Memory-mapped recorder is full ({self.capacity} samples); use ring=True or a larger capacity"
+            )
+        capacity = max(2 * self.capacity, needed)
+        for name, buffer in self._buffers.items():
+            grown = np.empty(capacity)
+            grown[: self.total] = buffer[: self.total]
+            self._buffers[name] = grown
+
+    def last(self, name):
+        """Most recently recorded value of a column."""
+        return self._buffers[name][(self.total - 1) % self.capacity]
+
+    def append(self, chunk, offset_column=None):
+        """Copy one chunk ({column: array}) into the buffers.
+
+        If `offset_column` is given, that column is shifted in place by its
+        last recorded value, e.g. to make each cycle's time continue from the
+        previous one.
+        """
+        n = len(chunk[self.columns[0]])
+        offset = self.last(offset_column) if offset_column is not None and self.total else 0.0
+        if not self.ring and self.total + n > self.capacity:
+            self._grow(self.total + n)
+
+        capacity = self.capacity
+        for name in self.columns:
+            values = np.asarray(chunk[name], dtype=np.float64)
+            buffer = self._buffers[name]
+            if not self.ring:
+                target = [slice(self.total, self.total + n)]
+            else:
+                values = values[-capacity:]
+                start = (self.total + n - len(values)) % capacity
+                end = start + len(values)
+                target = [slice(start, min(end, capacity)), slice(0, max(end - capacity, 0))]
+            written = 0
+            for section in target:
+                size = section.stop - section.start
+                buffer[section] = values[written : written + size]
+                if name == offset_column and offset:
+                    buffer[section] += offset
+                written += size
+        self.total += n
+
+    def data(self, name):
+        """Recorded samples of a column in time order (a view when possible)."""
+        buffer = self._buffers[name]
+        if not self.ring:
+            return buffer[: self.total]
+        if self.total <= self.capacity:
+            return buffer[: self.total]
+        head = self.total % self.capacity
+        return np.concatenate((buffer[head:], buffer[:head]))
+
+    def as_dict(self):
+        return {name: self.data(name) for name in self.columns}
@@ -1,6 +1,7 @@
 import pybamm
 import numpy as np
 import matplotlib.pyplot as plt
+from Aging_Campaign import AgingCampaign, summarise_cycle
 
 # Define the model
 model = pybamm.lithium_ion.DFN({"SEI": "ec reaction limited"})
@@ -24,24 +25,23 @@ cccv_experiment = pybamm.Experiment(
     ] * N
 )
 
-# First simulation for CCCV experiment
-sim = pybamm.Simulation(model, experiment=cccv_experiment, parameter_values=parameter_values)
-cccv_sol = sim.solve()
+# First simulation for CCCV experiment, built once and reused for every set
+campaign = AgingCampaign(model, parameter_values, {"cccv": cccv_experiment})
+cccv_sol = campaign.solve("cccv")
 
 # Plot last CCCV cycle
 pybamm.dynamic_plot(cccv_sol.cycles[-1], ["Current [A]", "Voltage [V]"])
 pybamm.plot_summary_variables(cccv_sol)
 
-# Run multiple sets of experiments (M sets)
-cccv_sols = []
+# Run multiple sets of experiments (M sets), streaming per-cycle summaries
+# so only the capacities are kept rather than every full solution
 M = 5
 
-for i in range(M):
-    if i != 0:  # Skip the first set of ageing cycles because it's already been done
-        sim = pybamm.Simulation(model, experiment=cccv_experiment, parameter_values=parameter_values)
-        cccv_sol = sim.solve(starting_solution=cccv_sol)
-    
-    cccv_sols.append(cccv_sol)
+# Skip the first set of ageing cycles because it's already been done
+summaries = [summarise_cycle(cycle, discharge_step=2) for cycle in cccv_sol.cycles]
+summaries.extend(
+    campaign.stream(["cccv"], sets=M - 1, starting_solution=cccv_sol, discharge_steps={"cccv": 2})
+)
 
 # Collect capacities for CCCV cycles
 cccv_cycles = []
@@ -50,9 +50,7 @@ cccv_capacities = []
 for i in range(M):
     for j in range(N):
         cccv_cycles.append(i * (N + 2) + j + 1)
-        start_capacity = cccv_sols[i].cycles[j].steps[2]["Discharge capacity [A.h]"].entries[0]
-        end_capacity = cccv_sols[i].cycles[j].steps[2]["Discharge capacity [A.h]"].entries[-1]
-        cccv_capacities.append(end_capacity - start_capacity)
+        cccv_capacities.append(summaries[i * N + j]["Discharge capacity [A.h]"])
 
  
 